@@ -6,13 +6,23 @@ import os
 import sys
 import json
 import glob
+import logging
+import functools
+import tempfile
+import threading
 import subprocess
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 import snowflake.connector
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import serialization
 
 
+# Progress and worker-thread messages go through logging so concurrent uploads
+# emit whole lines instead of interleaving partial prints
+logger = logging.getLogger(__name__)
+
 # Path to the config file (relative to this script)
 CONFIG_PATH = Path(__file__).parent / 'config.json'
 
@@ -27,6 +37,37 @@ AV_EXTENSIONS = {
     '.mp4', '.avi', '.mov', '.mkv', '.webm', '.flv', '.wmv', '.m4v'
 }
 
+# Files up to this size are uploaded together in a single wildcard PUT
+BATCH_PUT_MAX_BYTES = 64 * 1024 * 1024
+
+# Number of parallel upload threads the connector uses for the wildcard PUT
+BATCH_PUT_PARALLEL = 16
+
+# Chunk-upload threads shared by all concurrent single-file PUTs on the connection
+PUT_THREAD_BUDGET = 256
+
+# Manifest of files already uploaded, kept in the audio/video directory
+MANIFEST_NAME = '.sf_uploaded.json'
+
+# First-character classes that split file names into disjoint LIST @stage
+# partitions; the last class catches names not starting with a letter or digit
+STAGE_LIST_PARTITIONS = (
+    '0-9', 'a-cA-C', 'd-fD-F', 'g-iG-I', 'j-lJ-L', 'm-oM-O',
+    'p-rP-R', 's-uS-U', 'v-xV-X', 'y-zY-Z', '^0-9a-zA-Z/',
+)
+
+# Units used by format_size, one per power of 1024
+SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+# Per-thread cursor state for upload workers (see _worker_cursor)
+_worker_state = threading.local()
+_worker_cursors = []
+_worker_cursors_lock = threading.Lock()
+
+
+class UploaderError(RuntimeError):
+    """Raised for setup failures; only main() turns it into an exit status."""
+
 
 def load_config(config_path):
     """Load configuration from config.json."""
@@ -34,16 +75,21 @@ def load_config(config_path):
         with open(config_path, 'r') as f:
             return json.load(f)
     except FileNotFoundError:
-        print(f"Error: {config_path} not found.")
-        print("Please copy config.template.json to config.json and fill in your credentials.")
-        sys.exit(1)
+        raise UploaderError(
+            f"Error: {config_path} not found.\n"
+            "Please copy config.template.json to config.json and fill in your credentials."
+        )
     except json.JSONDecodeError as e:
-        print(f"Error parsing {config_path}: {e}")
-        sys.exit(1)
+        raise UploaderError(f"Error parsing {config_path}: {e}")
 
 
+@functools.lru_cache(maxsize=4)
 def load_private_key(private_key_path):
-    """Load and parse the private key file."""
+    """Load and parse the private key file.
+
+    The DER bytes are cached per path, so opening further connections does not
+    re-parse the PEM file.
+    """
     try:
         with open(private_key_path, 'rb') as key_file:
             private_key = serialization.load_pem_private_key(
@@ -60,14 +106,14 @@ def load_private_key(private_key_path):
         )
         return pkb
     except FileNotFoundError:
-        print(f"Error: Private key file not found at {private_key_path}")
-        print("\nTo generate RSA key pair:")
-        print("  openssl genrsa 2048 | openssl pkcs8 -topk8 -inform PEM -out rsa_key.p8 -nocrypt")
-        print("  openssl rsa -in rsa_key.p8 -pubout -out rsa_key.pub")
-        sys.exit(1)
+        raise UploaderError(
+            f"Error: Private key file not found at {private_key_path}\n"
+            "\nTo generate RSA key pair:\n"
+            "  openssl genrsa 2048 | openssl pkcs8 -topk8 -inform PEM -out rsa_key.p8 -nocrypt\n"
+            "  openssl rsa -in rsa_key.p8 -pubout -out rsa_key.pub"
+        )
     except Exception as e:
-        print(f"Error loading private key: {e}")
-        sys.exit(1)
+        raise UploaderError(f"Error loading private key: {e}")
 
 
 def connect_to_snowflake(config):
@@ -85,53 +131,143 @@ def connect_to_snowflake(config):
             warehouse=config.get('warehouse'),
             database=config.get('database'),
             schema=config.get('schema'),
-            role=config.get('role')
+            role=config.get('role'),
+            # Keep the session alive through long upload runs instead of re-authenticating
+            client_session_keep_alive=True,
+            client_prefetch_threads=config.get('prefetch_threads', 8)
         )
         print(f"✓ Connected as {config['user']} using key-pair authentication")
         return conn
     except Exception as e:
-        print(f"Error connecting to Snowflake: {e}")
-        sys.exit(1)
+        raise UploaderError(f"Error connecting to Snowflake: {e}")
+
 
+def start_stage_listing(conn, stage_name, parallel=False):
+    """Submit LIST @stage asynchronously and return the cursors that own the queries.
 
-def get_stage_files(conn, stage_name):
-    """Get list of files already in the Snowflake stage."""
+    The listing runs server-side while the local directory is scanned; pass the
+    cursors to get_stage_files to collect the result. With parallel=True the
+    stage is listed as one PATTERN-filtered query per STAGE_LIST_PARTITIONS
+    entry, all running at once. Returns None if the queries could not be
+    submitted, in which case get_stage_files lists synchronously.
+    """
+    if parallel:
+        queries = [
+            f"LIST @{stage_name} PATTERN='.*/[{chars}][^/]*'"
+            for chars in STAGE_LIST_PARTITIONS
+        ]
+    else:
+        queries = [f"LIST @{stage_name}"]
+    
+    cursors = []
+    try:
+        for query in queries:
+            cursor = conn.cursor()
+            cursors.append(cursor)
+            cursor.execute_async(query)
+        return cursors
+    except Exception:
+        for cursor in cursors:
+            cursor.close()
+        return None
+
+
+def _listed_file_names(cursor):
+    """File names from the LIST result on cursor."""
+    # Iterate the cursor rather than fetchall() so rows are streamed, not materialized
+    # Row format: (name, size, md5, last_modified)
+    # Keep just the filename from the full path in stage. Only the stage prefix
+    # is lower-cased by LIST; file names in the stage are case-sensitive
+    return frozenset(row[0].rsplit('/', 1)[-1] for row in cursor)
+
+
+def get_stage_files(conn, stage_name, listing_cursors=None):
+    """Get the names of files already in the Snowflake stage."""
     print(f"\nChecking files in stage @{stage_name}...")
     
     try:
-        cursor = conn.cursor()
-        # List files in the stage
-        cursor.execute(f"LIST @{stage_name}")
+        stage_files = None
+        if listing_cursors:
+            # Wait for the LIST queries submitted by start_stage_listing
+            try:
+                names = set()
+                for cursor in listing_cursors:
+                    cursor.get_results_from_sfqid(cursor.sfqid)
+                    names.update(_listed_file_names(cursor))
+                stage_files = frozenset(names)
+            except Exception as e:
+                print(f"Warning: Stage listing failed, listing again: {e}")
+            finally:
+                for cursor in listing_cursors:
+                    cursor.close()
         
-        stage_files = set()
-        for row in cursor.fetchall():
-            # Row format: (name, size, md5, last_modified)
-            file_path = row[0]  # Full path in stage
-            # Extract just the filename
-            filename = file_path.split('/')[-1]
-            stage_files.add(filename)
+        if stage_files is None:
+            cursor = conn.cursor()
+            # List files in the stage
+            cursor.execute(f"LIST @{stage_name}")
+            stage_files = _listed_file_names(cursor)
+            cursor.close()
         
-        cursor.close()
         print(f"✓ Found {len(stage_files)} file(s) in stage")
         return stage_files
     except Exception as e:
         print(f"Warning: Could not list stage files: {e}")
         print("Assuming stage is empty...")
-        return set()
+        return frozenset()
+
+
+def load_upload_manifest(av_dir, stage_name):
+    """Load the file names recorded as uploaded to stage_name.
+
+    Returns None if there is no usable manifest for this stage.
+    """
+    manifest_path = Path(av_dir) / MANIFEST_NAME
+    try:
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        if manifest.get('stage') != stage_name:
+            return None
+        return frozenset(manifest['files'])
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        print(f"Warning: Ignoring unreadable manifest {manifest_path}: {e}")
+        return None
+
+
+def save_upload_manifest(av_dir, stage_name, file_names):
+    """Record the names of files known to be in stage_name."""
+    manifest_path = Path(av_dir) / MANIFEST_NAME
+    try:
+        with open(manifest_path, 'w') as f:
+            json.dump({'stage': stage_name, 'files': sorted(file_names)}, f, indent=2)
+    except OSError as e:
+        print(f"Warning: Could not write manifest {manifest_path}: {e}")
 
 
 def get_local_av_files(av_dir='../AUDIO_VIDEO_STAGE_FILES'):
-    """Get list of audio/video files in the local directory."""
-    av_path = Path(av_dir)
+    """Get list of (path, size_bytes) tuples for audio/video files in the local directory.
+
+    Paths are absolute, so they can go straight into PUT commands.
+    """
+    # Resolve the directory once; scandir then yields absolute entry paths
+    av_path = Path(os.path.abspath(av_dir))
     
     if not av_path.exists():
         print(f"Error: Audio/Video directory not found: {av_dir}")
         return []
     
-    # Find all audio/video files
-    av_files = []
-    for ext in AV_EXTENSIONS:
-        av_files.extend(av_path.glob(f'*{ext}'))
+    # Find all audio/video files in a single directory pass; DirEntry.is_file()
+    # uses the file type cached by the directory read for regular files, and
+    # follows symlinks so linked media is picked up as before.
+    # The size is captured here so callers never need to stat the file again.
+    with os.scandir(av_path) as entries:
+        av_files = [
+            (Path(entry.path), entry.stat().st_size)
+            for entry in entries
+            if entry.is_file()
+            and os.path.splitext(entry.name)[1].lower() in AV_EXTENSIONS
+        ]
     
     # Sort by name
     av_files.sort()
@@ -140,10 +276,7 @@ def get_local_av_files(av_dir='../AUDIO_VIDEO_STAGE_FILES'):
     
     # Display file types summary
     if av_files:
-        ext_counts = {}
-        for f in av_files:
-            ext = f.suffix.lower()
-            ext_counts[ext] = ext_counts.get(ext, 0) + 1
+        ext_counts = Counter(f.suffix.lower() for f, _ in av_files)
         
         print("  File types:")
         for ext, count in sorted(ext_counts.items()):
@@ -154,28 +287,41 @@ def get_local_av_files(av_dir='../AUDIO_VIDEO_STAGE_FILES'):
 
 def format_size(size_bytes):
     """Format file size in human-readable format."""
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.1f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.1f} TB"
+    if size_bytes < 1024:
+        return f"{size_bytes:.1f} B"
+    # Each unit step is 10 bits, so the bit length picks the unit directly
+    unit_index = min((int(size_bytes).bit_length() - 1) // 10, len(SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * unit_index)):.1f} {SIZE_UNITS[unit_index]}"
+
+
+def put_parallelism(size_bytes, upload_workers=1):
+    """Number of chunk-upload threads for a PUT of a file of this size."""
+    # One thread per 64 MB, between Snowflake's default of 4 and its maximum of 99,
+    # capped so the concurrent workers together stay within PUT_THREAD_BUDGET
+    worker_cap = max(1, PUT_THREAD_BUDGET // max(1, upload_workers))
+    return min(99, max(4, size_bytes // (64 * 1024 * 1024)), worker_cap)
 
 
-def upload_file(conn, local_file, stage_name):
-    """Upload a single file to the Snowflake stage."""
+def put_source(path):
+    """Format a local path as the quoted file:// source of a PUT command."""
+    # Forward slashes work on every platform; then escape backslashes and quotes
+    # so the path survives as a single-quoted SQL string literal
+    uri = Path(path).as_posix().replace('\\', '\\\\').replace("'", "\\'")
+    return f"'file://{uri}'"
+
+
+def upload_file(cursor, local_file, stage_name, file_size=0, upload_workers=1):
+    """Upload a single file (absolute path) to the Snowflake stage using the given cursor."""
     try:
-        cursor = conn.cursor()
-        
-        # Convert to absolute path for PUT command
-        abs_path = os.path.abspath(local_file)
-        
         # PUT command to upload file (no compression for media files)
-        # Note: Wrap file path in single quotes to handle spaces and special characters
-        put_sql = f"PUT 'file://{abs_path}' @{stage_name} AUTO_COMPRESS=FALSE OVERWRITE=FALSE"
+        # Note: The quoted source handles spaces and special characters in the path
+        put_sql = (
+            f"PUT {put_source(local_file)} @{stage_name} AUTO_COMPRESS=FALSE OVERWRITE=FALSE "
+            f"PARALLEL={put_parallelism(file_size, upload_workers)}"
+        )
         
         cursor.execute(put_sql)
         result = cursor.fetchone()
-        cursor.close()
         
         # Check result status
         if result and 'UPLOADED' in str(result[6]).upper():
@@ -186,12 +332,91 @@ def upload_file(conn, local_file, stage_name):
             return False
             
     except Exception as e:
-        print(f"  Error uploading {local_file.name}: {e}")
+        logger.error("  Error uploading %s: %s", local_file.name, e)
         return False
 
 
-def upload_av_files(config, av_dir='../AUDIO_VIDEO_STAGE_FILES'):
-    """Main function to upload audio/video files to Snowflake stage."""
+def _worker_cursor(conn):
+    """Return the calling thread's cursor on conn, creating it on first use.
+
+    Each upload worker reuses one cursor for all of its PUTs instead of opening
+    and closing a cursor per file. Call _close_worker_cursors when done.
+    """
+    cursor = getattr(_worker_state, 'cursor', None)
+    if cursor is None or cursor.connection is not conn:
+        cursor = conn.cursor()
+        _worker_state.cursor = cursor
+        with _worker_cursors_lock:
+            _worker_cursors.append(cursor)
+    return cursor
+
+
+def _close_worker_cursors():
+    """Close every cursor handed out by _worker_cursor."""
+    with _worker_cursors_lock:
+        while _worker_cursors:
+            _worker_cursors.pop().close()
+
+
+def _upload_worker(conn, local_file, file_size, stage_name, upload_workers=1):
+    """Upload one file from a worker thread on that thread's cursor."""
+    return upload_file(_worker_cursor(conn), local_file, stage_name, file_size, upload_workers)
+
+
+def link_batch_files(local_files, batch_dir):
+    """Link local_files into batch_dir and return the files that could not be linked.
+
+    A single wildcard PUT on batch_dir then picks up exactly the linked subset.
+    """
+    unlinked = []
+    for local_file in local_files:
+        link_path = os.path.join(batch_dir, local_file.name)
+        try:
+            os.symlink(local_file, link_path)
+        except OSError:
+            try:
+                os.link(local_file, link_path)
+            except OSError:
+                unlinked.append(local_file)
+    return unlinked
+
+
+def upload_files_batch(conn, batch_dir, local_files, stage_name, parallel=BATCH_PUT_PARALLEL):
+    """Upload the files linked into batch_dir with one wildcard PUT and return {file: status}."""
+    cursor = _worker_cursor(conn)
+    put_sql = (
+        f"PUT {put_source(os.path.join(batch_dir, '*'))} @{stage_name} "
+        f"AUTO_COMPRESS=FALSE OVERWRITE=FALSE PARALLEL={parallel}"
+    )
+    
+    try:
+        cursor.execute(put_sql)
+        # One result row per file: (source, target, ..., status, message)
+        statuses = {row[0]: str(row[6]).upper() for row in cursor.fetchall()}
+    except Exception as e:
+        logger.error("  Error uploading batch of %d file(s): %s", len(local_files), e)
+        statuses = {}
+    
+    results = {}
+    for local_file in local_files:
+        status = statuses.get(local_file.name, '')
+        if 'UPLOADED' in status:
+            results[local_file] = True
+        elif 'SKIPPED' in status:
+            results[local_file] = 'SKIPPED'
+        else:
+            results[local_file] = False
+    
+    return results
+
+
+def upload_av_files(config, av_dir='../AUDIO_VIDEO_STAGE_FILES', verify=False):
+    """Main function to upload audio/video files to Snowflake stage.
+
+    Files recorded in the local upload manifest are treated as already staged,
+    which avoids listing the stage. Pass verify=True to list the stage anyway
+    and rebuild the manifest from it.
+    """
     print("=" * 80)
     print("Audio/Video File Uploader - Snowflake Transcription Stage")
     print("=" * 80)
@@ -203,6 +428,13 @@ def upload_av_files(config, av_dir='../AUDIO_VIDEO_STAGE_FILES'):
     conn = connect_to_snowflake(config)
     
     try:
+        manifest_files = None if verify else load_upload_manifest(av_dir, stage_name)
+        
+        # Start listing the stage so the server round trip overlaps the local scan
+        listing_cursors = None
+        if manifest_files is None:
+            listing_cursors = start_stage_listing(conn, stage_name, config.get('parallel_list', False))
+        
         # Get local AV files
         local_files = get_local_av_files(av_dir)
         
@@ -211,22 +443,26 @@ def upload_av_files(config, av_dir='../AUDIO_VIDEO_STAGE_FILES'):
             return
         
         # Get files already in stage
-        stage_files = get_stage_files(conn, stage_name)
+        if manifest_files is None:
+            stage_files = get_stage_files(conn, stage_name, listing_cursors)
+            save_upload_manifest(av_dir, stage_name, stage_files)
+        else:
+            stage_files = manifest_files
+            print(f"\n✓ Upload manifest lists {len(stage_files)} file(s) in stage (use --verify to re-check)")
         
-        # Determine which files need to be uploaded
+        # Determine which files need to be uploaded, totalling their size in the same pass
         files_to_upload = []
-        already_uploaded = []
-        
-        for local_file in local_files:
+        total_size = 0
+        for local_file, file_size in local_files:
             if local_file.name not in stage_files:
-                files_to_upload.append(local_file)
-            else:
-                already_uploaded.append(local_file)
+                files_to_upload.append((local_file, file_size))
+                total_size += file_size
+        already_uploaded = len(local_files) - len(files_to_upload)
         
         print(f"\n{'=' * 80}")
         print(f"Upload Plan:")
         print(f"  Total local files:     {len(local_files)}")
-        print(f"  Already in stage:      {len(already_uploaded)}")
+        print(f"  Already in stage:      {already_uploaded}")
         print(f"  Files to upload:       {len(files_to_upload)}")
         print(f"{'=' * 80}\n")
         
@@ -234,34 +470,71 @@ def upload_av_files(config, av_dir='../AUDIO_VIDEO_STAGE_FILES'):
             print("✓ All files are already uploaded to the stage!")
             return
         
-        # Show files to upload with sizes
-        total_size = 0
-        for file_path in files_to_upload:
-            file_size = file_path.stat().st_size
-            total_size += file_size
-        
         print(f"Total upload size: {format_size(total_size)}\n")
         
-        # Upload files
+        # Upload files concurrently; each worker owns its own cursor on the shared connection
+        upload_workers = config.get('upload_workers', 8)
         uploaded_count = 0
         skipped_count = 0
         failed_count = 0
+        staged_names = set(stage_files)
         
-        for i, file_path in enumerate(files_to_upload, 1):
-            file_size = format_size(file_path.stat().st_size)
-            print(f"[{i}/{len(files_to_upload)}] Uploading: {file_path.name} ({file_size})...", end=' ')
-            
-            result = upload_file(conn, file_path, stage_name)
-            
-            if result is True:
-                print("✓ UPLOADED")
-                uploaded_count += 1
-            elif result == 'SKIPPED':
-                print("⊘ SKIPPED (already exists)")
-                skipped_count += 1
+        # Largest files first so the biggest uploads start early and small ones fill the tail
+        files_to_upload.sort(key=lambda item: item[1], reverse=True)
+        file_sizes = dict(files_to_upload)
+        
+        # Small files go up together in one wildcard PUT; larger files are uploaded individually
+        batch_files = []
+        single_files = []
+        for file_path, file_size in files_to_upload:
+            if file_size <= BATCH_PUT_MAX_BYTES:
+                batch_files.append(file_path)
             else:
-                print("✗ FAILED")
-                failed_count += 1
+                single_files.append(file_path)
+        if len(batch_files) < 2:
+            single_files.extend(batch_files)
+            batch_files = []
+        
+        with tempfile.TemporaryDirectory() as batch_dir, ThreadPoolExecutor(max_workers=upload_workers) as executor:
+            futures = {}
+            if batch_files:
+                # Files that cannot be linked into the batch go to the pool as individual uploads
+                unlinked = link_batch_files(batch_files, batch_dir)
+                if unlinked:
+                    single_files.extend(unlinked)
+                    batch_files = [f for f in batch_files if f not in unlinked]
+            if batch_files:
+                futures[executor.submit(upload_files_batch, conn, batch_dir, batch_files, stage_name)] = None
+            for file_path in single_files:
+                futures[executor.submit(_upload_worker, conn, file_path, file_sizes[file_path], stage_name, upload_workers)] = file_path
+            
+            progress = 0
+            for future in as_completed(futures):
+                if futures[future] is None:
+                    completed = future.result().items()
+                else:
+                    completed = [(futures[future], future.result())]
+                
+                for file_path, result in completed:
+                    progress += 1
+                    file_size = format_size(file_sizes[file_path])
+                    
+                    if result is True:
+                        status = "✓ UPLOADED"
+                        uploaded_count += 1
+                        staged_names.add(file_path.name)
+                    elif result == 'SKIPPED':
+                        status = "⊘ SKIPPED (already exists)"
+                        skipped_count += 1
+                        staged_names.add(file_path.name)
+                    else:
+                        status = "✗ FAILED"
+                        failed_count += 1
+                    
+                    logger.info("[%d/%d] %s (%s)... %s", progress, len(files_to_upload), file_path.name, file_size, status)
+        
+        _close_worker_cursors()
+        save_upload_manifest(av_dir, stage_name, staged_names)
         
         # Summary
         print(f"\n{'=' * 80}")
@@ -272,13 +545,16 @@ def upload_av_files(config, av_dir='../AUDIO_VIDEO_STAGE_FILES'):
         print(f"  ━ Total:    {len(files_to_upload)}")
         print(f"{'=' * 80}")
         
-        # Verify upload
+        # Report stage contents; only re-list the stage when asked to verify
         if uploaded_count > 0:
-            print("\nVerifying stage contents...")
-            cursor = conn.cursor()
-            cursor.execute(f"LIST @{stage_name}")
-            total_in_stage = len(cursor.fetchall())
-            cursor.close()
+            if verify:
+                print("\nVerifying stage contents...")
+                cursor = conn.cursor()
+                cursor.execute(f"LIST @{stage_name}")
+                total_in_stage = sum(1 for _ in cursor)
+                cursor.close()
+            else:
+                total_in_stage = len(staged_names)
             print(f"✓ Total files in stage @{stage_name}: {total_in_stage}")
             print(f"\nℹ️  The automated transcription pipeline will process these files within 5 minutes.")
         
@@ -291,6 +567,14 @@ def main():
     """Main entry point."""
     import argparse
     
+    # Progress lines go to stdout; only this module logs at INFO, so the
+    # connector's own INFO records stay out of the output
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    
     parser = argparse.ArgumentParser(
         description="Upload audio/video files from local folder to Snowflake stage for transcription"
     )
@@ -300,6 +584,11 @@ def main():
         default='../AUDIO_VIDEO_STAGE_FILES',
         help='Directory containing audio/video files (default: ../AUDIO_VIDEO_STAGE_FILES)'
     )
+    parser.add_argument(
+        '--verify',
+        action='store_true',
+        help=f'List the stage instead of trusting the local upload manifest ({MANIFEST_NAME})'
+    )
     
     args = parser.parse_args()
     
@@ -312,20 +601,25 @@ def main():
         print("\nThen configure the public key in Snowflake using create_av_service_user.sql")
         sys.exit(1)
     
-    # Load configuration
-    print("Loading configuration from config.json...")
-    config = load_config(CONFIG_PATH)
-    
-    # Check if account is configured
-    if config.get('account') == 'YOUR_ACCOUNT_IDENTIFIER':
-        print("Error: Please update the 'account' value in config.json")
-        print("Replace 'YOUR_ACCOUNT_IDENTIFIER' with your actual Snowflake account identifier")
+    try:
+        # Load configuration
+        print("Loading configuration from config.json...")
+        config = load_config(CONFIG_PATH)
+        
+        # Check if account is configured
+        if config.get('account') == 'YOUR_ACCOUNT_IDENTIFIER':
+            raise UploaderError(
+                "Error: Please update the 'account' value in config.json\n"
+                "Replace 'YOUR_ACCOUNT_IDENTIFIER' with your actual Snowflake account identifier"
+            )
+        
+        print("✓ Configuration loaded successfully\n")
+        
+        # Upload AV files
+        upload_av_files(config, args.directory, verify=args.verify)
+    except UploaderError as e:
+        print(e)
         sys.exit(1)
-    
-    print("✓ Configuration loaded successfully\n")
-    
-    # Upload AV files
-    upload_av_files(config, args.directory)
 
     # Offer Gong sync
     print()
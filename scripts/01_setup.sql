@@ -139,6 +139,12 @@ CREATE OR REPLACE TABLE IDENTIFIER($PROJECT_RESULTS_TABLE) (
     PARTICIPANTS_JSON VARIANT          -- Participant metadata (name/email/title/affiliation)
 );
 
+-- OPTIONAL (opt-in): speed up the dashboard's keyword search (TRANSCRIPT / MEETING_TITLE ILIKE '%term%').
+-- Search optimization requires Enterprise Edition or higher and adds storage and ongoing
+-- serverless maintenance cost, so it is left commented out. See "Optional: Faster Dashboard
+-- Search" in the README before enabling it.
+-- ALTER TABLE IDENTIFIER($PROJECT_RESULTS_TABLE) ADD SEARCH OPTIMIZATION ON SUBSTRING(TRANSCRIPT, MEETING_TITLE);
+
 -- Create a view for easy querying (using dynamic SQL to resolve table name)
 DECLARE
     view_sql VARCHAR;
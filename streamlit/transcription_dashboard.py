@@ -1,10 +1,17 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
 from snowflake.snowpark.context import get_active_session
 import re
-import json
+import html
+import functools
 import io
+import csv
+
+# Characters replaced with '_' when building download file names
+FILENAME_UNSAFE_RE = re.compile(r'[^\w\-_\.]')
+SEARCH_TERM_UNSAFE_RE = re.compile(r'[^\w\-_]')
 
 # Page configuration
 st.set_page_config(
@@ -14,59 +21,22 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for better styling
-st.markdown("""
-<style>
-    .metric-container {
-        background-color: #f0f2f6;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border-left: 0.25rem solid #1f77b4;
-        margin: 0.5rem 0;
-    }
-    .search-result {
-        background-color: #f8f9fa;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        margin: 0.5rem 0;
-    }
-    .transcript-box {
-        background-color: #ffffff;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border: 1px solid #e0e0e0;
-        margin: 0.5rem 0;
-    }
-    .speaker-segment {
-        background-color: #f9f9f9;
-        padding: 0.75rem;
-        border-radius: 0.25rem;
-        border-left: 0.25rem solid #4CAF50;
-        margin: 0.5rem 0;
-    }
-    .speaker-label {
-        font-weight: bold;
-        color: #2E7D32;
-        font-size: 0.9rem;
-        margin-bottom: 0.25rem;
-    }
-    .speaker-text {
-        color: #333;
-        line-height: 1.5;
-    }
-    .timestamp {
-        color: #666;
-        font-size: 0.8rem;
-    }
-    .info-box {
-        background-color: #e7f3ff;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border-left: 0.25rem solid #0066cc;
-        margin: 1rem 0;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Custom CSS for better styling, minified since it is re-sent on every rerun
+_CSS = (
+    '<style>'
+    '.metric-grid{display:grid;grid-template-columns:repeat(6,1fr);gap:0.75rem}'
+    '.metric-container{background-color:#f0f2f6;padding:1rem;border-radius:0.5rem;border-left:0.25rem solid #1f77b4;margin:0.5rem 0}'
+    '.metric-label{color:#555;font-size:0.875rem}'
+    '.metric-value{font-size:1.75rem;font-weight:600}'
+    '.search-result{background-color:#f8f9fa;padding:1rem;border-radius:0.5rem;margin:0.5rem 0}'
+    '.transcript-box{background-color:#ffffff;padding:1rem;border-radius:0.5rem;border:1px solid #e0e0e0;margin:0.5rem 0}'
+    '.speaker-segment{background-color:#f9f9f9;padding:0.75rem;border-radius:0.25rem;border-left:0.25rem solid #4CAF50;margin:0.5rem 0}'
+    '.speaker-label{font-weight:bold;color:#2E7D32;font-size:0.9rem;margin-bottom:0.25rem}'
+    '.speaker-text{color:#333;line-height:1.5}'
+    '.timestamp{color:#666;font-size:0.8rem}'
+    '.info-box{background-color:#e7f3ff;padding:1rem;border-radius:0.5rem;border-left:0.25rem solid #0066cc;margin:1rem 0}'
+    '</style>'
+)
 
 @st.cache_resource
 def get_snowflake_connection():
@@ -79,152 +49,304 @@ def get_snowflake_connection():
         st.info("Make sure you're running this in Snowflake's Streamlit environment.")
         return None
 
-def load_transcription_data(session, limit=1000):
-    """Load transcription data from Snowflake"""
-    if session is None:
-        return pd.DataFrame()
-    
-    query = f"""
+@st.cache_data(ttl="5m", max_entries=8, show_spinner=False)
+def _query_transcription_data(_session, limit):
+    """Cached metadata query (per limit; _session is not hashed). Errors propagate so they are not cached."""
+    query = """
     SELECT 
         FILE_NAME,
         FILE_TYPE,
         DETECTED_LANGUAGE,
-        TRANSCRIPT,
-        TRANSCRIPT_WITH_SPEAKERS,
+        COALESCE(IFF(LENGTH(TRANSCRIPT) > 200, LEFT(TRANSCRIPT, 200) || '...', TRANSCRIPT), '') AS TRANSCRIPT_PREVIEW,
+        REGEXP_COUNT(TRANSCRIPT, '[^[:space:]]+') AS WORD_COUNT,
         SPEAKER_COUNT,
         PROCESSING_TIME_SECONDS,
         FILE_SIZE_BYTES,
         AUDIO_DURATION_SECONDS,
-        SRT_CONTENT,
-        SRT_WITH_SPEAKERS,
-        SUMMARY_MARKDOWN,
         TRANSCRIPTION_TIMESTAMP,
         MEETING_TITLE,
         ACCOUNT_NAME,
-        CALL_START_TS,
+        CALL_START_TS
+    FROM TRANSCRIPTION_RESULTS 
+    ORDER BY TRANSCRIPTION_TIMESTAMP DESC 
+    LIMIT ?
+    """
+    
+    df = _session.sql(query, params=[int(limit)]).to_pandas()
+    df['FILE_SIZE_MB'] = df['FILE_SIZE_BYTES'] / (1024 * 1024)
+    # Index by file name (column kept) so per-file lookups are hashed rather than scanned
+    df = df.set_index('FILE_NAME', drop=False)
+    df.index.name = None
+    return df
+
+def load_transcription_data(session, limit=1000):
+    """Load transcription metadata from Snowflake.
+    
+    The large text columns stay in Snowflake; see load_transcript_detail.
+    """
+    if session is None:
+        return pd.DataFrame()
+    
+    try:
+        return _query_transcription_data(session, limit)
+    except Exception as e:
+        st.error(f"Error loading data: {str(e)}")
+        return pd.DataFrame()
+
+@st.cache_data(ttl="15m", max_entries=64, show_spinner=False)
+def _query_transcript_detail(_session, file_name):
+    """Cached detail query for one file. Errors propagate so they are not cached."""
+    query = """
+    SELECT 
+        TRANSCRIPT,
+        SRT_CONTENT,
+        SRT_WITH_SPEAKERS,
+        SUMMARY_MARKDOWN,
         KEY_POINTS,
         NEXT_STEPS,
         DECISIONS_MADE,
         QUESTIONS_RAISED
     FROM TRANSCRIPTION_RESULTS 
-    ORDER BY TRANSCRIPTION_TIMESTAMP DESC 
-    LIMIT {limit}
+    WHERE FILE_NAME = ?
+    ORDER BY TRANSCRIPTION_TIMESTAMP DESC
+    LIMIT 1
     """
     
+    result = _session.sql(query, params=[file_name]).to_pandas()
+    return result.iloc[0].to_dict() if not result.empty else {}
+
+def load_transcript_detail(session, file_name):
+    """Load the full transcript, SRT exports and summary fields for one file"""
+    if session is None:
+        return {}
+    
     try:
-        return session.sql(query).to_pandas()
+        return _query_transcript_detail(session, file_name)
     except Exception as e:
-        st.error(f"Error loading data: {str(e)}")
-        return pd.DataFrame()
+        st.error(f"Error loading transcript: {str(e)}")
+        return {}
+
+@st.cache_data(ttl="5m", show_spinner=False)
+def _query_summary_stats(_session):
+    """Cached summary statistics query. Errors propagate so they are not cached."""
+    query = """
+    SELECT 
+        COUNT(*) AS TOTAL_FILES,
+        COALESCE(SUM(AUDIO_DURATION_SECONDS) / 3600, 0) AS TOTAL_HOURS,
+        COALESCE(AVG(PROCESSING_TIME_SECONDS), 0) AS AVG_PROC,
+        COUNT(DISTINCT DETECTED_LANGUAGE) AS LANGS,
+        COUNT_IF(TRANSCRIPT_WITH_SPEAKERS IS NOT NULL) AS WITH_SPEAKERS,
+        COALESCE(AVG(CASE WHEN SPEAKER_COUNT > 0 THEN SPEAKER_COUNT END), 0) AS AVG_SPK,
+        COUNT(DISTINCT ACCOUNT_NAME) AS ACCOUNTS
+    FROM TRANSCRIPTION_RESULTS
+    """
+    
+    row = _session.sql(query).to_pandas().iloc[0]
+    return {
+        'total_files': row['TOTAL_FILES'],
+        'total_duration': row['TOTAL_HOURS'],
+        'avg_processing_time': row['AVG_PROC'],
+        'languages': row['LANGS'],
+        'files_with_speakers': row['WITH_SPEAKERS'],
+        'avg_speakers': row['AVG_SPK'],
+        'account_count': row['ACCOUNTS']
+    }
 
 def get_summary_stats(session):
-    """Get summary statistics"""
+    """Get summary statistics in a single aggregate query"""
     if session is None:
         return {}
     
-    stats = {}
-    
     try:
-        # Total files
-        result = session.sql("SELECT COUNT(*) as count FROM TRANSCRIPTION_RESULTS").to_pandas()
-        stats['total_files'] = result.iloc[0, 0] if not result.empty else 0
-        
-        # Total duration in hours
-        result = session.sql("SELECT SUM(AUDIO_DURATION_SECONDS)/3600 as hours FROM TRANSCRIPTION_RESULTS WHERE AUDIO_DURATION_SECONDS IS NOT NULL").to_pandas()
-        stats['total_duration'] = result.iloc[0, 0] if not result.empty and result.iloc[0, 0] is not None else 0
-        
-        # Average processing time
-        result = session.sql("SELECT AVG(PROCESSING_TIME_SECONDS) as avg_time FROM TRANSCRIPTION_RESULTS").to_pandas()
-        stats['avg_processing_time'] = result.iloc[0, 0] if not result.empty else 0
-        
-        # Number of languages
-        result = session.sql("SELECT COUNT(DISTINCT DETECTED_LANGUAGE) as count FROM TRANSCRIPTION_RESULTS").to_pandas()
-        stats['languages'] = result.iloc[0, 0] if not result.empty else 0
-        
-        # Files with speaker data
-        result = session.sql("SELECT COUNT(*) as count FROM TRANSCRIPTION_RESULTS WHERE TRANSCRIPT_WITH_SPEAKERS IS NOT NULL").to_pandas()
-        stats['files_with_speakers'] = result.iloc[0, 0] if not result.empty else 0
-        
-        # Average speakers per file
-        result = session.sql("SELECT AVG(SPEAKER_COUNT) as avg_speakers FROM TRANSCRIPTION_RESULTS WHERE SPEAKER_COUNT > 0").to_pandas()
-        stats['avg_speakers'] = result.iloc[0, 0] if not result.empty and result.iloc[0, 0] is not None else 0
-
-        # Distinct accounts
-        result = session.sql("SELECT COUNT(DISTINCT ACCOUNT_NAME) as count FROM TRANSCRIPTION_RESULTS WHERE ACCOUNT_NAME IS NOT NULL").to_pandas()
-        stats['account_count'] = result.iloc[0, 0] if not result.empty else 0
-        
+        return _query_summary_stats(session)
     except Exception as e:
         st.warning(f"Error getting statistics: {str(e)}")
-        stats = {'total_files': 0, 'total_duration': 0, 'avg_processing_time': 0, 'languages': 0, 'files_with_speakers': 0, 'avg_speakers': 0, 'account_count': 0}
+        return {'total_files': 0, 'total_duration': 0, 'avg_processing_time': 0, 'languages': 0, 'files_with_speakers': 0, 'avg_speakers': 0, 'account_count': 0}
+
+def dataset_key(df):
+    """Cheap fingerprint of the loaded dataset, used to key caches of derived data.
+    
+    Hashing a whole DataFrame costs about as much as the aggregations themselves, so
+    cached helpers take the frame as an unhashed _df and this key instead.
+    """
+    if df.empty:
+        return (0,)
+    timestamps = df['TRANSCRIPTION_TIMESTAMP']
+    return (len(df), str(timestamps.iloc[0]), str(timestamps.iloc[-1]))
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def get_overview_aggregates(_df, df_key):
+    """Chart series for the Overview tab, recomputed only when the dataset changes"""
+    dates = pd.to_datetime(_df['TRANSCRIPTION_TIMESTAMP']).dt.date.rename('DATE')
+    return {
+        'accounts': _df['ACCOUNT_NAME'].dropna().value_counts().head(10),
+        'file_types': _df['FILE_TYPE'].value_counts(),
+        'timeline': _df.groupby(dates).size().rename('Files Processed'),
+        'languages': _df['DETECTED_LANGUAGE'].value_counts().head(10)
+    }
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def get_analytics_aggregates(_df, df_key):
+    """Per file type efficiency and per language transcript length over the loaded rows"""
+    means = _df.groupby('FILE_TYPE')[['PROCESSING_TIME_SECONDS', 'AUDIO_DURATION_SECONDS']].mean()
+    return {
+        'efficiency': (means['PROCESSING_TIME_SECONDS'] / means['AUDIO_DURATION_SECONDS'].replace(0, np.nan)).rename('PROCESSING_RATIO'),
+        'words_by_language': _df.groupby('DETECTED_LANGUAGE')['WORD_COUNT'].mean().sort_values(ascending=False).head(10)
+    }
+
+def histogram_series(values, bins=20, decimals=0):
+    """Bin a numeric column for st.bar_chart, indexed by each bin's lower edge.
+    
+    Labels get extra decimals when needed to stay unique; st.bar_chart stacks bars
+    that share an x value. They stay numeric so the axis keeps its numeric order.
+    """
+    counts, edges = np.histogram(values.dropna(), bins=bins)
+    lower_edges = edges[:-1]
+    labels = lower_edges.round(decimals)
+    while len(np.unique(labels)) < len(labels) and decimals < 6:
+        decimals += 1
+        labels = lower_edges.round(decimals)
+    return pd.Series(counts, index=labels)
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def get_filter_options(_df, df_key):
+    """Sorted choices for the filter selectboxes, shared by the Search and Browse tabs"""
+    return {
+        'file_types': sorted(_df['FILE_TYPE'].dropna().unique().tolist()),
+        'languages': sorted(_df['DETECTED_LANGUAGE'].dropna().unique().tolist()),
+        'accounts': sorted(_df['ACCOUNT_NAME'].dropna().unique().tolist())
+    }
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def get_speaker_file_options(_df, df_key):
+    """Speaker View choices: display labels (meeting title, else file name) mapped to file names.
+    
+    Falls back to the ten most recent files when none have speaker data.
+    """
+    speaker_mask = _df['SPEAKER_COUNT'] > 0
+    has_speakers = bool(speaker_mask.any())
+    files = _df.loc[speaker_mask, ['MEETING_TITLE', 'FILE_NAME']] if has_speakers else _df.head(10)
+    labels = files['MEETING_TITLE'].where(files['MEETING_TITLE'].notna(), files['FILE_NAME']).tolist()
+    return {
+        'has_speakers': has_speakers,
+        'labels': labels,
+        'label_to_filename': dict(zip(labels, files['FILE_NAME']))
+    }
+
+@st.cache_data(ttl="15m", max_entries=64, show_spinner=False)
+def _query_speaker_segments(_session, file_name):
+    """Cached segment query for one file, flattened server-side. Errors propagate so they are not cached."""
+    query = """
+    SELECT 
+        COALESCE(s.value:speaker::STRING, 'Unknown') AS "speaker",
+        COALESCE(s.value:text::STRING, '') AS "text",
+        COALESCE(s.value:start_time::FLOAT, 0) AS "start_time",
+        COALESCE(s.value:end_time::FLOAT, 0) AS "end_time",
+        COALESCE(s.value:duration::FLOAT, s.value:end_time::FLOAT - s.value:start_time::FLOAT, 0) AS "duration"
+    FROM (
+        -- A file re-transcribed more than once has several rows; use only the latest
+        SELECT FILE_NAME, TRANSCRIPT_WITH_SPEAKERS
+        FROM TRANSCRIPTION_RESULTS
+        WHERE FILE_NAME = ?
+        QUALIFY ROW_NUMBER() OVER (PARTITION BY FILE_NAME ORDER BY TRANSCRIPTION_TIMESTAMP DESC) = 1
+    ) r,
+        LATERAL FLATTEN(input => r.TRANSCRIPT_WITH_SPEAKERS:speakers) s
+    ORDER BY "start_time", s.index
+    """
     
-    return stats
+    return _session.sql(query, params=[file_name]).to_pandas().to_dict("records")
 
 def get_speaker_segments(session, file_name):
     """Get speaker segments for a specific file"""
     if session is None:
         return []
     
+    try:
+        return _query_speaker_segments(session, file_name)
+    except Exception as e:
+        st.error(f"Error loading speaker segments: {str(e)}")
+        return []
+
+@st.cache_data(ttl="15m", max_entries=16, show_spinner=False)
+def _query_speaker_segments_bulk(_session, file_names):
+    """Cached segment query for several files. Errors propagate so they are not cached."""
+    placeholders = ", ".join("?" for _ in file_names)
     query = f"""
     SELECT 
-        FILE_NAME,
-        TRANSCRIPT_WITH_SPEAKERS,
-        SPEAKER_COUNT,
-        DETECTED_LANGUAGE,
-        AUDIO_DURATION_SECONDS
-    FROM TRANSCRIPTION_RESULTS 
-    WHERE FILE_NAME = '{file_name}' 
-    AND TRANSCRIPT_WITH_SPEAKERS IS NOT NULL
+        r.FILE_NAME AS "file_name",
+        COALESCE(s.value:speaker::STRING, 'Unknown') AS "speaker",
+        COALESCE(s.value:text::STRING, '') AS "text",
+        COALESCE(s.value:start_time::FLOAT, 0) AS "start_time",
+        COALESCE(s.value:end_time::FLOAT, 0) AS "end_time",
+        COALESCE(s.value:duration::FLOAT, s.value:end_time::FLOAT - s.value:start_time::FLOAT, 0) AS "duration"
+    FROM (
+        -- One source row per file, the latest transcription, as in _query_speaker_segments
+        SELECT FILE_NAME, TRANSCRIPT_WITH_SPEAKERS
+        FROM TRANSCRIPTION_RESULTS
+        WHERE FILE_NAME IN ({placeholders})
+        QUALIFY ROW_NUMBER() OVER (PARTITION BY FILE_NAME ORDER BY TRANSCRIPTION_TIMESTAMP DESC) = 1
+    ) r,
+        LATERAL FLATTEN(input => r.TRANSCRIPT_WITH_SPEAKERS:speakers) s
+    ORDER BY r.FILE_NAME, "start_time", s.index
     """
     
+    segments = _session.sql(query, params=list(file_names)).to_pandas()
+    return {
+        file_name: group.drop(columns="file_name").to_dict("records")
+        for file_name, group in segments.groupby("file_name", sort=False)
+    }
+
+def get_speaker_segments_bulk(session, file_names):
+    """Get speaker segments for several files in one query, keyed by file name"""
+    if session is None or not file_names:
+        return {}
+    
     try:
-        result = session.sql(query).to_pandas()
-        if result.empty:
-            return []
-        
-        # Parse the JSON data
-        transcript_data = result.iloc[0]['TRANSCRIPT_WITH_SPEAKERS']
-        if transcript_data is None:
-            return []
-        
-        # If it's a string, parse it as JSON
-        if isinstance(transcript_data, str):
-            transcript_data = json.loads(transcript_data)
-        
-        return transcript_data.get('speakers', [])
-        
+        return _query_speaker_segments_bulk(session, file_names)
     except Exception as e:
         st.error(f"Error loading speaker segments: {str(e)}")
-        return []
+        return {}
 
 def search_transcriptions(session, search_term, file_type=None, language=None, date_range=None, account_name=None):
-    """Search transcriptions"""
+    """Search transcriptions (all user input is bound, never interpolated)"""
     if session is None:
         return pd.DataFrame()
     
-    where_conditions = [f"(TRANSCRIPT ILIKE '%{search_term}%' OR MEETING_TITLE ILIKE '%{search_term}%')"]
+    # Substring predicates can use the opt-in SUBSTRING search optimization (see README)
+    like_term = f"%{search_term}%"
+    where_conditions = ["(TRANSCRIPT ILIKE ? OR MEETING_TITLE ILIKE ?)"]
+    params = [search_term, like_term, like_term]
     
     if file_type and file_type != "All":
-        where_conditions.append(f"FILE_TYPE = '{file_type}'")
+        where_conditions.append("FILE_TYPE = ?")
+        params.append(file_type)
     
     if language and language != "All":
-        where_conditions.append(f"DETECTED_LANGUAGE = '{language}'")
+        where_conditions.append("DETECTED_LANGUAGE = ?")
+        params.append(language)
     
     if account_name and account_name != "All":
-        where_conditions.append(f"ACCOUNT_NAME = '{account_name}'")
+        where_conditions.append("ACCOUNT_NAME = ?")
+        params.append(account_name)
     
     if date_range:
         start_date, end_date = date_range
-        where_conditions.append(f"DATE(TRANSCRIPTION_TIMESTAMP) BETWEEN '{start_date}' AND '{end_date}'")
+        where_conditions.append("DATE(TRANSCRIPTION_TIMESTAMP) BETWEEN ? AND ?")
+        params.extend([str(start_date), str(end_date)])
     
     where_clause = " AND ".join(where_conditions)
     
+    # Only a snippet around the first hit is returned; speaker segments are
+    # fetched per result by get_speaker_segments
     query = f"""
     SELECT 
         FILE_NAME,
         FILE_TYPE,
         DETECTED_LANGUAGE,
-        TRANSCRIPT,
-        TRANSCRIPT_WITH_SPEAKERS,
+        GREATEST(1, POSITION(LOWER(?) IN LOWER(TRANSCRIPT)) - 100) AS SNIPPET_START,
+        SUBSTR(TRANSCRIPT, SNIPPET_START, 500) AS SNIPPET,
+        LENGTH(TRANSCRIPT) AS TRANSCRIPT_LENGTH,
+        TRANSCRIPT_WITH_SPEAKERS IS NOT NULL AS HAS_SPEAKERS,
         SPEAKER_COUNT,
         TRANSCRIPTION_TIMESTAMP,
         AUDIO_DURATION_SECONDS,
@@ -238,49 +360,154 @@ def search_transcriptions(session, search_term, file_type=None, language=None, d
     """
     
     try:
-        return session.sql(query).to_pandas()
+        results = session.sql(query, params=params).to_pandas()
     except Exception as e:
         st.error(f"Search error: {str(e)}")
         return pd.DataFrame()
+    
+    # Mark snippets that start after the beginning or stop short of the end of the transcript
+    snippets = results['SNIPPET'].fillna('')
+    starts = results['SNIPPET_START'].fillna(1)
+    ends = starts + snippets.str.len() - 1
+    snippets = snippets.mask(starts > 1, '...' + snippets)
+    results['SNIPPET'] = snippets.mask(ends < results['TRANSCRIPT_LENGTH'], snippets + '...')
+    return results
+
+# Column names cannot be bound, so the Browse sort column is checked against this list
+BROWSE_SORT_COLUMNS = ["TRANSCRIPTION_TIMESTAMP", "FILE_NAME", "SPEAKER_COUNT", "PROCESSING_TIME_SECONDS", "AUDIO_DURATION_SECONDS"]
+
+@st.cache_data(ttl="5m", max_entries=32, show_spinner=False)
+def _query_page(_session, file_type, language, account_name, sort_by, offset, limit):
+    """Cached Browse page query. Errors propagate so they are not cached."""
+    if sort_by not in BROWSE_SORT_COLUMNS:
+        sort_by = BROWSE_SORT_COLUMNS[0]
+    
+    where_conditions = []
+    params = []
+    
+    if file_type != "All":
+        where_conditions.append("FILE_TYPE = ?")
+        params.append(file_type)
+    
+    if language != "All":
+        where_conditions.append("DETECTED_LANGUAGE = ?")
+        params.append(language)
+    
+    if account_name != "All":
+        where_conditions.append("ACCOUNT_NAME = ?")
+        params.append(account_name)
+    
+    where_clause = f"WHERE {' AND '.join(where_conditions)}" if where_conditions else ""
+    params.extend([int(limit), int(offset)])
+    
+    query = f"""
+    SELECT 
+        FILE_NAME,
+        FILE_TYPE,
+        DETECTED_LANGUAGE,
+        COALESCE(IFF(LENGTH(TRANSCRIPT) > 200, LEFT(TRANSCRIPT, 200) || '...', TRANSCRIPT), '') AS TRANSCRIPT_PREVIEW,
+        SPEAKER_COUNT,
+        PROCESSING_TIME_SECONDS,
+        AUDIO_DURATION_SECONDS,
+        TRANSCRIPTION_TIMESTAMP,
+        MEETING_TITLE,
+        ACCOUNT_NAME,
+        CALL_START_TS,
+        COUNT(*) OVER () AS TOTAL_ROWS
+    FROM TRANSCRIPTION_RESULTS 
+    {where_clause}
+    ORDER BY {sort_by} DESC NULLS LAST, FILE_NAME
+    LIMIT ? OFFSET ?
+    """
+    
+    return _session.sql(query, params=params).to_pandas()
+
+def fetch_page(session, file_type="All", language="All", account_name="All", sort_by="TRANSCRIPTION_TIMESTAMP", offset=0, limit=20):
+    """Fetch one filtered, sorted page of Browse rows; TOTAL_ROWS carries the match count"""
+    if session is None:
+        return pd.DataFrame()
+    
+    try:
+        return _query_page(session, file_type, language, account_name, sort_by, offset, limit)
+    except Exception as e:
+        st.error(f"Error loading page: {str(e)}")
+        return pd.DataFrame()
 
 def find_matching_segments_with_context(speaker_segments, search_term, context_size=10):
     """Find speaker segments that match search term and return with context"""
     if not speaker_segments or not search_term:
         return []
     
+    # One scan over the whole transcript rules out files where the term only
+    # matched the title, before any DataFrame is built
+    needle = search_term.casefold()
+    if needle not in '\0'.join(segment.get('text') or '' for segment in speaker_segments).casefold():
+        return []
+    
     # Sort segments by start time
-    sorted_segments = sorted(speaker_segments, key=lambda x: x.get('start_time', 0))
+    df = pd.DataFrame(speaker_segments)
+    if 'start_time' in df:
+        df = df.sort_values('start_time', kind='stable', ignore_index=True)
     
     # Find segments containing the search term
-    matching_indices = []
-    for i, segment in enumerate(sorted_segments):
-        text = segment.get('text', '').lower()
-        if search_term.lower() in text:
-            matching_indices.append(i)
+    texts = df['text'].fillna('').astype(str).str.casefold()
+    match_indices = np.flatnonzero(texts.str.contains(needle, regex=False).to_numpy())
     
-    if not matching_indices:
+    if len(match_indices) == 0:
         return []
     
-    # Extract context around matches
-    context_segments = []
-    added_indices = set()
+    # Each segment belongs to the first match whose window reaches it
+    positions = np.arange(len(df))
+    first_match = np.searchsorted(match_indices, positions - context_size)
+    in_range = first_match < len(match_indices)
+    context_group = match_indices[np.minimum(first_match, len(match_indices) - 1)]
+    keep = in_range & (context_group <= positions + context_size)
+    
+    context_df = df.loc[keep].copy()
+    context_df['is_match'] = context_group[keep] == positions[keep]
+    context_df['context_group'] = context_group[keep]
+    return context_df.to_dict('records')
+
+# One speaker-segment card; SEGMENT_STYLES fills in the per-variant attributes
+SEGMENT_TEMPLATE = (
+    '<div class="speaker-segment"{segment_style}>'
+    '<div class="speaker-label"{label_style}>{speaker} <span class="timestamp">({time_range}){match_tag}</span></div>'
+    '<div class="speaker-text"{text_style}>{text}</div></div>'
+)
+SEGMENT_STYLES = {
+    'match': {
+        'segment_style': ' style="border-left-color: #FF5722; background-color: #FFF3E0;"',
+        'label_style': ' style="color: #E65100;"',
+        'text_style': ' style="font-weight: 500;"',
+        'match_tag': ' 🎯 MATCH'
+    },
+    'context': {
+        'segment_style': ' style="border-left-color: #9E9E9E; background-color: #FAFAFA;"',
+        'label_style': ' style="color: #616161;"',
+        'text_style': ' style="color: #757575;"',
+        'match_tag': ''
+    },
+    'plain': {'segment_style': '', 'label_style': '', 'text_style': '', 'match_tag': ''}
+}
+
+def _group_consecutive(df, extra_keys=()):
+    """Merge consecutive segments from the same speaker that are less than 2s apart.
     
-    for match_idx in matching_indices:
-        # Calculate context range
-        start_idx = max(0, match_idx - context_size)
-        end_idx = min(len(sorted_segments), match_idx + context_size + 1)
-        
-        # Add segments in context range
-        for i in range(start_idx, end_idx):
-            if i not in added_indices:
-                segment = sorted_segments[i].copy()
-                segment['is_match'] = (i == match_idx)
-                segment['context_group'] = match_idx  # Group segments by their match
-                context_segments.append(segment)
-                added_indices.add(i)
-    
-    # Sort by start time to maintain chronological order
-    return sorted(context_segments, key=lambda x: x.get('start_time', 0))
+    Any column in extra_keys must also stay the same for segments to merge.
+    """
+    prev_end = df['end_time'].shift()
+    boundary = (
+        (df['speaker'] != df['speaker'].shift())
+        | prev_end.isna() | (prev_end == 0)
+        | ((df['start_time'] - prev_end).abs() >= 2)
+    )
+    for key in extra_keys:
+        boundary |= df[key] != df[key].shift()
+    
+    agg = {'speaker': 'first', 'text': ' '.join, 'start_time': 'first', 'end_time': 'last'}
+    agg.update({key: 'first' for key in extra_keys})
+    df = df.assign(text=df['text'].fillna('').astype(str).str.strip())
+    return df.groupby(boundary.cumsum(), sort=False).agg(agg)
 
 def display_search_result_with_speakers(speaker_segments, search_term, file_info=None):
     """Display search results with speaker segments and context"""
@@ -298,121 +525,68 @@ def display_search_result_with_speakers(speaker_segments, search_term, file_info
         """)
     
     # Group consecutive segments by speaker to reduce repetition (similar to display_speaker_transcript)
-    grouped_segments = []
-    current_speaker = None
-    current_text = ""
-    current_start = None
-    current_end = None
-    current_is_match = False
-    current_context_group = None
-    
-    for segment in speaker_segments:
-        speaker = segment.get('speaker', 'Unknown')
-        text = segment.get('text', '').strip()
-        start_time = segment.get('start_time', 0)
-        end_time = segment.get('end_time', 0)
-        is_match = segment.get('is_match', False)
-        context_group = segment.get('context_group')
-        
-        # Only group if same speaker, close timing, same match status, and same context group
-        if (speaker == current_speaker and 
-            current_end and abs(start_time - current_end) < 2 and
-            is_match == current_is_match and
-            context_group == current_context_group):
-            # Same speaker, close timing, same match status - combine segments
-            current_text += " " + text
-            current_end = end_time
-        else:
-            # Different speaker, gap in time, or different match status - save previous and start new
-            if current_speaker is not None:
-                grouped_segments.append({
-                    'speaker': current_speaker,
-                    'text': current_text,
-                    'start_time': current_start,
-                    'end_time': current_end,
-                    'is_match': current_is_match,
-                    'context_group': current_context_group
-                })
-            
-            current_speaker = speaker
-            current_text = text
-            current_start = start_time
-            current_end = end_time
-            current_is_match = is_match
-            current_context_group = context_group
+    grouped_segments = _group_consecutive(pd.DataFrame(speaker_segments), extra_keys=('is_match', 'context_group'))
+    grouped_segments['time_range'] = _format_time_ranges(grouped_segments)
     
-    # Don't forget the last segment
-    if current_speaker is not None:
-        grouped_segments.append({
-            'speaker': current_speaker,
-            'text': current_text,
-            'start_time': current_start,
-            'end_time': current_end,
-            'is_match': current_is_match,
-            'context_group': current_context_group
-        })
-    
-    # Display the grouped segments with context
+    # Display the grouped segments with context, rendered as one HTML block
     current_context_group = None
     match_count = 0
+    parts = []
     
-    for i, segment in enumerate(grouped_segments):
-        speaker = segment['speaker']
-        text = segment['text']
-        start_time = segment.get('start_time', 0)
-        end_time = segment.get('end_time', 0)
-        is_match = segment.get('is_match', False)
-        context_group = segment.get('context_group')
+    for segment in grouped_segments.itertuples(index=False):
+        speaker = segment.speaker
+        text = segment.text
+        time_range = segment.time_range
+        is_match = segment.is_match
+        context_group = segment.context_group
         
         # Add separator between different context groups
         if context_group != current_context_group and current_context_group is not None:
-            st.markdown("---")
+            parts.append('<hr/>')
         
         if context_group != current_context_group:
             current_context_group = context_group
             if is_match:
                 match_count += 1
-                st.markdown(f"**🎯 Match {match_count}:**")
-        
-        # Format time as MM:SS
-        start_mins, start_secs = divmod(int(start_time), 60)
-        end_mins, end_secs = divmod(int(end_time), 60)
-        time_range = f"{start_mins:02d}:{start_secs:02d} - {end_mins:02d}:{end_secs:02d}"
+                parts.append(f'<p><strong>🎯 Match {match_count}:</strong></p>')
         
-        # Highlight search term in matching segments
-        display_text = text
-        if is_match:
-            display_text = highlight_text(text, search_term)
+        # Highlight search term in matching segments; context text is only escaped
+        display_text = highlight_text(text, search_term if is_match else None)
         
         # Different styling for match vs context
-        if is_match:
-            # Highlight the matching segment
-            st.markdown(f"""
-            <div class="speaker-segment" style="border-left-color: #FF5722; background-color: #FFF3E0;">
-                <div class="speaker-label" style="color: #E65100;">{speaker} <span class="timestamp">({time_range}) 🎯 MATCH</span></div>
-                <div class="speaker-text" style="font-weight: 500;">{display_text}</div>
-            </div>
-            """, unsafe_allow_html=True)
-        else:
-            # Regular context segment
-            st.markdown(f"""
-            <div class="speaker-segment" style="border-left-color: #9E9E9E; background-color: #FAFAFA;">
-                <div class="speaker-label" style="color: #616161;">{speaker} <span class="timestamp">({time_range})</span></div>
-                <div class="speaker-text" style="color: #757575;">{display_text}</div>
-            </div>
-            """, unsafe_allow_html=True)
+        style = SEGMENT_STYLES['match' if is_match else 'context']
+        parts.append(SEGMENT_TEMPLATE.format_map(dict(style, speaker=html.escape(str(speaker)), time_range=time_range, text=display_text)))
+    
+    st.markdown("".join(parts), unsafe_allow_html=True)
+
+@functools.lru_cache(maxsize=256)
+def _compile_highlight(search_term):
+    """Compile the case-insensitive highlight pattern once per search term.
+    
+    The term is captured so split() returns the matches between the other pieces.
+    """
+    return re.compile(f"({re.escape(search_term)})", re.IGNORECASE)
 
 def highlight_text(text, search_term):
-    """Highlight search term in text"""
-    if not search_term or not text:
+    """Highlight search term in text (HTML; callers render with unsafe_allow_html)"""
+    if not text:
         return text
     
-    # Simple highlighting by making search term bold
-    pattern = re.compile(re.escape(search_term), re.IGNORECASE)
-    return pattern.sub(f"**{search_term.upper()}**", str(text))
+    text = str(text)
+    if not search_term:
+        return html.escape(text)
+    
+    # Match on the raw text, then escape each piece, so a match can never land inside
+    # an HTML entity. <mark> keeps the original casing and also renders inside the HTML
+    # segment cards, unlike **bold**
+    pieces = _compile_highlight(search_term).split(text)
+    return "".join(
+        f"<mark>{html.escape(piece)}</mark>" if i % 2 else html.escape(piece)
+        for i, piece in enumerate(pieces)
+    )
 
-def display_speaker_transcript(speaker_segments, file_info=None):
-    """Display transcript with speaker segments line by line"""
+def display_speaker_transcript(speaker_segments, file_info=None, as_table=False):
+    """Display transcript with speaker segments line by line, or as a virtualized table"""
     if not speaker_segments:
         st.info("No speaker segments available for this file.")
         return
@@ -426,335 +600,168 @@ def display_speaker_transcript(speaker_segments, file_info=None):
         """)
         st.divider()
     
-    # Sort segments by start time
-    sorted_segments = sorted(speaker_segments, key=lambda x: x.get('start_time', 0))
-    
-    # Group consecutive segments by speaker to reduce repetition
-    grouped_segments = []
-    current_speaker = None
-    current_text = ""
-    current_start = None
-    current_end = None
-    
-    for segment in sorted_segments:
-        speaker = segment.get('speaker', 'Unknown')
-        text = segment.get('text', '').strip()
-        start_time = segment.get('start_time', 0)
-        end_time = segment.get('end_time', 0)
-        
-        if speaker == current_speaker and current_end and abs(start_time - current_end) < 2:
-            # Same speaker, close timing - combine segments
-            current_text += " " + text
-            current_end = end_time
-        else:
-            # Different speaker or gap in time - save previous and start new
-            if current_speaker is not None:
-                grouped_segments.append({
-                    'speaker': current_speaker,
-                    'text': current_text,
-                    'start_time': current_start,
-                    'end_time': current_end
-                })
-            
-            current_speaker = speaker
-            current_text = text
-            current_start = start_time
-            current_end = end_time
-    
-    # Don't forget the last segment
-    if current_speaker is not None:
-        grouped_segments.append({
-            'speaker': current_speaker,
-            'text': current_text,
-            'start_time': current_start,
-            'end_time': current_end
-        })
-    
-    # Display the grouped segments
-    for i, segment in enumerate(grouped_segments):
-        speaker = segment['speaker']
-        text = segment['text']
-        start_time = segment.get('start_time', 0)
-        end_time = segment.get('end_time', 0)
-        
-        # Format time as MM:SS
-        start_mins, start_secs = divmod(int(start_time), 60)
-        end_mins, end_secs = divmod(int(end_time), 60)
-        time_range = f"{start_mins:02d}:{start_secs:02d} - {end_mins:02d}:{end_secs:02d}"
+    # Sort segments by start time, then group consecutive segments by speaker to reduce repetition
+    df = pd.DataFrame(speaker_segments).sort_values('start_time', kind='stable')
+    grouped_segments = _group_consecutive(df)
+    grouped_segments['time_range'] = _format_time_ranges(grouped_segments)
+    
+    # Table mode only renders the rows in view, which keeps long meetings responsive
+    if as_table:
+        st.dataframe(
+            grouped_segments[['speaker', 'time_range', 'text']],
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                'speaker': st.column_config.TextColumn("Speaker"),
+                'time_range': st.column_config.TextColumn("Time"),
+                'text': st.column_config.TextColumn("Text", width="large")
+            }
+        )
+        return
+    
+    # Display the grouped segments, rendered as one HTML block; ASR text and speaker
+    # labels are escaped so stray markup cannot break the segments that follow
+    parts = []
+    for segment in grouped_segments.itertuples(index=False):
+        speaker = html.escape(str(segment.speaker))
+        text = html.escape(str(segment.text))
+        time_range = segment.time_range
         
-        # Display the segment
-        st.markdown(f"""
-        <div class="speaker-segment">
-            <div class="speaker-label">{speaker} <span class="timestamp">({time_range})</span></div>
-            <div class="speaker-text">{text}</div>
-        </div>
-        """, unsafe_allow_html=True)
+        parts.append(SEGMENT_TEMPLATE.format_map(dict(SEGMENT_STYLES['plain'], speaker=speaker, time_range=time_range, text=text)))
+    
+    st.markdown("".join(parts), unsafe_allow_html=True)
+
+SPEAKER_CSV_HEADER = ['Segment', 'Speaker', 'Start_Time', 'End_Time', 'Start_Seconds', 'End_Seconds', 'Duration_Seconds', 'Text']
+SEARCH_CSV_HEADER = ['Segment', 'Speaker', 'Start_Time', 'End_Time', 'Start_Seconds', 'End_Seconds', 'Duration_Seconds', 'Is_Match', 'Match_Group', 'Text']
+
+def _csv_metadata_rows(header, fields):
+    """Metadata rows placed above the segment rows, padded to the header width"""
+    padding = [''] * (len(header) - 3)
+    rows = [['METADATA', name, value] + padding for name, value in fields]
+    rows.append(['---'] * len(header))
+    return rows
+
+def _file_info_fields(file_info):
+    """File metadata shown above exported segments"""
+    return [
+        ('File', file_info.get('filename', 'Unknown')),
+        ('Language', file_info.get('language', 'Unknown')),
+        ('Duration', f"{file_info.get('duration', 0):.1f}s"),
+        ('Export_Date', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    ]
+
+def _format_mmss(seconds):
+    """Format an array of seconds as MM:SS strings in one vectorized pass"""
+    mins, secs = np.divmod(np.asarray(seconds, dtype='float64').astype('int64'), 60)
+    return np.char.add(np.char.add(np.char.mod('%02d', mins), ':'), np.char.mod('%02d', secs))
+
+def _format_time_ranges(df):
+    """MM:SS - MM:SS labels for each row of a segment DataFrame"""
+    return np.char.add(np.char.add(_format_mmss(df['start_time']), ' - '), _format_mmss(df['end_time']))
+
+def _format_srt_timestamps(seconds):
+    """Format an array of seconds as SRT timestamps (HH:MM:SS,mmm)"""
+    total_ms = np.rint(np.asarray(seconds, dtype='float64') * 1000).astype('int64')
+    hours, remainder = np.divmod(total_ms, 3600000)
+    minutes, remainder = np.divmod(remainder, 60000)
+    secs, millis = np.divmod(remainder, 1000)
+    hhmm = np.char.add(np.char.add(np.char.mod('%02d', hours), ':'), np.char.mod('%02d', minutes))
+    ssms = np.char.add(np.char.add(np.char.mod('%02d', secs), ','), np.char.mod('%03d', millis))
+    return np.char.add(np.char.add(hhmm, ':'), ssms)
+
+def _segment_frame(segments):
+    """Segments as a DataFrame sorted by start time, with stripped text"""
+    df = pd.DataFrame(segments).sort_values('start_time', kind='stable', ignore_index=True)
+    df['text'] = df['text'].fillna('').astype(str).str.strip()
+    if 'duration' not in df:
+        df['duration'] = df['end_time'] - df['start_time']
+    return df
+
+def _segment_csv_columns(df):
+    """Speaker, formatted times, raw seconds and duration columns for the CSV rows"""
+    return [
+        df['speaker'].tolist(),
+        _format_mmss(df['start_time']).tolist(),
+        _format_mmss(df['end_time']).tolist(),
+        df['start_time'].tolist(),
+        df['end_time'].tolist(),
+        # Built-in round, not numpy's, so values like 1.665 keep rounding the same way
+        [round(duration, 2) for duration in df['duration'].tolist()]
+    ]
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _speaker_segments_csv_rows(speaker_segments):
+    """Segment rows of the speaker CSV, cached apart from the metadata (its Export_Date is per export)"""
+    df = _segment_frame(speaker_segments)
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='\n').writerows(
+        zip(range(1, len(df) + 1), *_segment_csv_columns(df), df['text'].tolist()))
+    return buffer.getvalue()
 
 def convert_speaker_segments_to_csv(speaker_segments, file_info=None):
-    """Convert speaker segments to CSV format"""
+    """Convert speaker segments to CSV text"""
     if not speaker_segments:
         return None
     
-    # Sort segments by start time
-    sorted_segments = sorted(speaker_segments, key=lambda x: x.get('start_time', 0))
-    
-    # Prepare data for CSV
-    csv_data = []
-    
-    for i, segment in enumerate(sorted_segments, 1):
-        speaker = segment.get('speaker', 'Unknown')
-        text = segment.get('text', '').strip()
-        start_time = segment.get('start_time', 0)
-        end_time = segment.get('end_time', 0)
-        duration = segment.get('duration', end_time - start_time)
-        
-        # Format timestamps
-        start_mins, start_secs = divmod(int(start_time), 60)
-        end_mins, end_secs = divmod(int(end_time), 60)
-        start_time_formatted = f"{start_mins:02d}:{start_secs:02d}"
-        end_time_formatted = f"{end_mins:02d}:{end_secs:02d}"
-        
-        csv_data.append({
-            'Segment': i,
-            'Speaker': speaker,
-            'Start_Time': start_time_formatted,
-            'End_Time': end_time_formatted,
-            'Start_Seconds': start_time,
-            'End_Seconds': end_time,
-            'Duration_Seconds': round(duration, 2),
-            'Text': text
-        })
-    
-    # Create DataFrame
-    df = pd.DataFrame(csv_data)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(SPEAKER_CSV_HEADER)
     
     # Add metadata at the top if available
     if file_info:
-        metadata_rows = []
-        metadata_rows.append({
-            'Segment': 'METADATA',
-            'Speaker': 'File',
-            'Start_Time': file_info.get('filename', 'Unknown'),
-            'End_Time': '',
-            'Start_Seconds': '',
-            'End_Seconds': '',
-            'Duration_Seconds': '',
-            'Text': ''
-        })
-        metadata_rows.append({
-            'Segment': 'METADATA',
-            'Speaker': 'Language',
-            'Start_Time': file_info.get('language', 'Unknown'),
-            'End_Time': '',
-            'Start_Seconds': '',
-            'End_Seconds': '',
-            'Duration_Seconds': '',
-            'Text': ''
-        })
-        metadata_rows.append({
-            'Segment': 'METADATA',
-            'Speaker': 'Duration',
-            'Start_Time': f"{file_info.get('duration', 0):.1f}s",
-            'End_Time': '',
-            'Start_Seconds': '',
-            'End_Seconds': '',
-            'Duration_Seconds': '',
-            'Text': ''
-        })
-        metadata_rows.append({
-            'Segment': 'METADATA',
-            'Speaker': 'Export_Date',
-            'Start_Time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'End_Time': '',
-            'Start_Seconds': '',
-            'End_Seconds': '',
-            'Duration_Seconds': '',
-            'Text': ''
-        })
-        metadata_rows.append({
-            'Segment': '---',
-            'Speaker': '---',
-            'Start_Time': '---',
-            'End_Time': '---',
-            'Start_Seconds': '---',
-            'End_Seconds': '---',
-            'Duration_Seconds': '---',
-            'Text': '---'
-        })
-        
-        # Combine metadata and data
-        metadata_df = pd.DataFrame(metadata_rows)
-        df = pd.concat([metadata_df, df], ignore_index=True)
+        writer.writerows(_csv_metadata_rows(SPEAKER_CSV_HEADER, _file_info_fields(file_info)))
     
-    return df
+    buffer.write(_speaker_segments_csv_rows(speaker_segments))
+    return buffer.getvalue()
 
-def create_csv_download(df, filename):
-    """Create CSV file for download"""
-    if df is None or df.empty:
-        return None
-    
-    # Convert DataFrame to CSV
-    csv_buffer = io.StringIO()
-    df.to_csv(csv_buffer, index=False)
-    csv_string = csv_buffer.getvalue()
-    
-    return csv_string
+@st.cache_data(max_entries=32, show_spinner=False)
+def _search_results_csv_rows(context_segments):
+    """Segment rows of the search results CSV, cached apart from the metadata"""
+    df = _segment_frame(context_segments)
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='\n').writerows(zip(
+        range(1, len(df) + 1),
+        *_segment_csv_columns(df),
+        np.where(df['is_match'], 'YES', 'CONTEXT').tolist(),
+        (df['context_group'] + 1).tolist(),
+        df['text'].tolist()
+    ))
+    return buffer.getvalue()
 
 def convert_search_results_to_csv(context_segments, file_info=None, search_term=""):
-    """Convert search results with context to CSV format"""
+    """Convert search results with context to CSV text"""
     if not context_segments:
         return None
     
-    # Sort segments by start time
-    sorted_segments = sorted(context_segments, key=lambda x: x.get('start_time', 0))
-    
-    # Prepare data for CSV
-    csv_data = []
-    
-    for i, segment in enumerate(sorted_segments, 1):
-        speaker = segment.get('speaker', 'Unknown')
-        text = segment.get('text', '').strip()
-        start_time = segment.get('start_time', 0)
-        end_time = segment.get('end_time', 0)
-        duration = segment.get('duration', end_time - start_time)
-        is_match = segment.get('is_match', False)
-        context_group = segment.get('context_group', 0)
-        
-        # Format timestamps
-        start_mins, start_secs = divmod(int(start_time), 60)
-        end_mins, end_secs = divmod(int(end_time), 60)
-        start_time_formatted = f"{start_mins:02d}:{start_secs:02d}"
-        end_time_formatted = f"{end_mins:02d}:{end_secs:02d}"
-        
-        csv_data.append({
-            'Segment': i,
-            'Speaker': speaker,
-            'Start_Time': start_time_formatted,
-            'End_Time': end_time_formatted,
-            'Start_Seconds': start_time,
-            'End_Seconds': end_time,
-            'Duration_Seconds': round(duration, 2),
-            'Is_Match': 'YES' if is_match else 'CONTEXT',
-            'Match_Group': context_group + 1,
-            'Text': text
-        })
-    
-    # Create DataFrame
-    df = pd.DataFrame(csv_data)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(SEARCH_CSV_HEADER)
     
     # Add metadata at the top if available
     if file_info:
-        metadata_rows = []
-        metadata_rows.append({
-            'Segment': 'METADATA',
-            'Speaker': 'Search_Term',
-            'Start_Time': search_term,
-            'End_Time': '',
-            'Start_Seconds': '',
-            'End_Seconds': '',
-            'Duration_Seconds': '',
-            'Is_Match': '',
-            'Match_Group': '',
-            'Text': ''
-        })
-        metadata_rows.append({
-            'Segment': 'METADATA',
-            'Speaker': 'File',
-            'Start_Time': file_info.get('filename', 'Unknown'),
-            'End_Time': '',
-            'Start_Seconds': '',
-            'End_Seconds': '',
-            'Duration_Seconds': '',
-            'Is_Match': '',
-            'Match_Group': '',
-            'Text': ''
-        })
-        metadata_rows.append({
-            'Segment': 'METADATA',
-            'Speaker': 'Language',
-            'Start_Time': file_info.get('language', 'Unknown'),
-            'End_Time': '',
-            'Start_Seconds': '',
-            'End_Seconds': '',
-            'Duration_Seconds': '',
-            'Is_Match': '',
-            'Match_Group': '',
-            'Text': ''
-        })
-        metadata_rows.append({
-            'Segment': 'METADATA',
-            'Speaker': 'Duration',
-            'Start_Time': f"{file_info.get('duration', 0):.1f}s",
-            'End_Time': '',
-            'Start_Seconds': '',
-            'End_Seconds': '',
-            'Duration_Seconds': '',
-            'Is_Match': '',
-            'Match_Group': '',
-            'Text': ''
-        })
-        metadata_rows.append({
-            'Segment': 'METADATA',
-            'Speaker': 'Export_Date',
-            'Start_Time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'End_Time': '',
-            'Start_Seconds': '',
-            'End_Seconds': '',
-            'Duration_Seconds': '',
-            'Is_Match': '',
-            'Match_Group': '',
-            'Text': ''
-        })
-        metadata_rows.append({
-            'Segment': '---',
-            'Speaker': '---',
-            'Start_Time': '---',
-            'End_Time': '---',
-            'Start_Seconds': '---',
-            'End_Seconds': '---',
-            'Duration_Seconds': '---',
-            'Is_Match': '---',
-            'Match_Group': '---',
-            'Text': '---'
-        })
-        
-        # Combine metadata and data
-        metadata_df = pd.DataFrame(metadata_rows)
-        df = pd.concat([metadata_df, df], ignore_index=True)
+        fields = [('Search_Term', search_term)] + _file_info_fields(file_info)
+        writer.writerows(_csv_metadata_rows(SEARCH_CSV_HEADER, fields))
     
-    return df
+    buffer.write(_search_results_csv_rows(context_segments))
+    return buffer.getvalue()
 
+@st.cache_data(max_entries=32, show_spinner=False)
 def convert_speaker_segments_to_srt(speaker_segments, file_info=None, include_speakers=True):
     """Convert speaker segments to SRT subtitle format"""
     if not speaker_segments:
         return None
     
-    # Sort segments by start time
-    sorted_segments = sorted(speaker_segments, key=lambda x: x.get('start_time', 0))
+    df = _segment_frame(speaker_segments)
+    start_timestamps = _format_srt_timestamps(df['start_time']).tolist()
+    end_timestamps = _format_srt_timestamps(df['end_time']).tolist()
     
     srt_content = []
     
-    for i, segment in enumerate(sorted_segments, 1):
-        speaker = segment.get('speaker', 'Unknown')
-        text = segment.get('text', '').strip()
-        start_time = segment.get('start_time', 0)
-        end_time = segment.get('end_time', 0)
-        
+    for i, (speaker, text, start_timestamp, end_timestamp) in enumerate(
+            zip(df['speaker'], df['text'], start_timestamps, end_timestamps), 1):
         if not text:  # Skip empty segments
             continue
         
-        # Format timestamps for SRT (HH:MM:SS,mmm)
-        start_hours, start_remainder = divmod(int(start_time), 3600)
-        start_minutes, start_seconds = divmod(start_remainder, 60)
-        start_milliseconds = int((start_time - int(start_time)) * 1000)
-        
-        end_hours, end_remainder = divmod(int(end_time), 3600)
-        end_minutes, end_seconds = divmod(end_remainder, 60)
-        end_milliseconds = int((end_time - int(end_time)) * 1000)
-        
-        start_timestamp = f"{start_hours:02d}:{start_minutes:02d}:{start_seconds:02d},{start_milliseconds:03d}"
-        end_timestamp = f"{end_hours:02d}:{end_minutes:02d}:{end_seconds:02d},{end_milliseconds:03d}"
-        
         # Format subtitle text
         if include_speakers and speaker != 'Unknown':
             subtitle_text = f"{speaker}: {text}"
@@ -767,39 +774,24 @@ def convert_speaker_segments_to_srt(speaker_segments, file_info=None, include_sp
     
     return "\n".join(srt_content)
 
+@st.cache_data(max_entries=32, show_spinner=False)
 def convert_search_results_to_srt(context_segments, file_info=None, search_term="", include_speakers=True):
     """Convert search results with context to SRT subtitle format"""
     if not context_segments:
         return None
     
-    # Sort segments by start time
-    sorted_segments = sorted(context_segments, key=lambda x: x.get('start_time', 0))
+    df = _segment_frame(context_segments)
+    start_timestamps = _format_srt_timestamps(df['start_time']).tolist()
+    end_timestamps = _format_srt_timestamps(df['end_time']).tolist()
     
     srt_content = []
     subtitle_number = 1
     
-    for segment in sorted_segments:
-        speaker = segment.get('speaker', 'Unknown')
-        text = segment.get('text', '').strip()
-        start_time = segment.get('start_time', 0)
-        end_time = segment.get('end_time', 0)
-        is_match = segment.get('is_match', False)
-        
+    for speaker, text, start_timestamp, end_timestamp, is_match in zip(
+            df['speaker'], df['text'], start_timestamps, end_timestamps, df['is_match']):
         if not text:  # Skip empty segments
             continue
         
-        # Format timestamps for SRT (HH:MM:SS,mmm)
-        start_hours, start_remainder = divmod(int(start_time), 3600)
-        start_minutes, start_seconds = divmod(start_remainder, 60)
-        start_milliseconds = int((start_time - int(start_time)) * 1000)
-        
-        end_hours, end_remainder = divmod(int(end_time), 3600)
-        end_minutes, end_seconds = divmod(end_remainder, 60)
-        end_milliseconds = int((end_time - int(end_time)) * 1000)
-        
-        start_timestamp = f"{start_hours:02d}:{start_minutes:02d}:{start_seconds:02d},{start_milliseconds:03d}"
-        end_timestamp = f"{end_hours:02d}:{end_minutes:02d}:{end_seconds:02d},{end_milliseconds:03d}"
-        
         # Format subtitle text with match indication
         if include_speakers and speaker != 'Unknown':
             if is_match:
@@ -819,7 +811,434 @@ def convert_search_results_to_srt(context_segments, file_info=None, search_term=
     
     return "\n".join(srt_content)
 
+@st.fragment
+def render_search_tab(session, filter_options):
+    """Search tab; runs as a fragment so its widgets only rerun this tab"""
+    st.header("🔍 Search Transcriptions")
+    
+    # Search controls
+    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
+    
+    with col1:
+        search_term = st.text_input("Search in transcripts:", placeholder="Enter keywords to search...")
+    
+    with col2:
+        selected_file_type = st.selectbox("File Type:", ["All"] + filter_options['file_types'])
+    
+    with col3:
+        selected_language = st.selectbox("Language:", ["All"] + filter_options['languages'])
+
+    with col4:
+        selected_account = st.selectbox("Account:", ["All"] + filter_options['accounts'])
+    
+    # Additional search options
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        start_date = st.date_input("From date:", value=datetime.now().date() - timedelta(days=30))
+    with col2:
+        end_date = st.date_input("To date:", value=datetime.now().date())
+    with col3:
+        context_size = st.number_input(
+            "Context messages:", 
+            min_value=0, 
+            max_value=50, 
+            value=10,
+            help="Number of messages before and after each match to show for context"
+        )
+    
+    # Search options
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        show_speaker_view = st.checkbox("Show speaker segments", value=True, help="Display results with speaker-by-speaker breakdown")
+    with col2:
+        st.markdown("") # Spacer
+    
+    # Search execution
+    if st.button("🔍 Search", type="primary") and search_term:
+        with st.spinner("Searching transcriptions..."):
+            search_results = search_transcriptions(
+                session, search_term, 
+                selected_file_type if selected_file_type != "All" else None,
+                selected_language if selected_language != "All" else None,
+                (start_date, end_date),
+                selected_account if selected_account != "All" else None
+            )
+        # Kept in session state so the export buttons below can rerun the tab without losing the results
+        # A fresh table key per search also clears the previous row selection
+        st.session_state['search_runs'] = st.session_state.get('search_runs', 0) + 1
+        st.session_state['last_search'] = {
+            'term': search_term,
+            'results': search_results,
+            'exports': set(),
+            'table_key': f"search_table_{st.session_state['search_runs']}"
+        }
+    elif search_term == "":
+        st.warning("Please enter a search term.")
+    
+    last_search = st.session_state.get('last_search')
+    if last_search is not None and search_term:
+        search_term = last_search['term']
+        search_results = last_search['results']
+        
+        st.subheader(f"Search Results ({len(search_results)} found)")
+        
+        if not search_results.empty:
+            records = search_results.to_dict('records')
+            
+            # One table for the result list; matches and exports render only for the selected row
+            summary_df = pd.DataFrame({
+                'Title': search_results['MEETING_TITLE'].fillna(search_results['FILE_NAME']),
+                'Account': search_results['ACCOUNT_NAME'],
+                'Date': search_results['CALL_START_TS'].fillna(search_results['TRANSCRIPTION_TIMESTAMP']).astype(str).str[:10],
+                'Type': search_results['FILE_TYPE'],
+                'Language': search_results['DETECTED_LANGUAGE'],
+                'Speakers': search_results['SPEAKER_COUNT'],
+                'Duration (s)': search_results['AUDIO_DURATION_SECONDS'].round(1)
+            })
+            event = st.dataframe(
+                summary_df,
+                on_select="rerun",
+                selection_mode="single-row",
+                hide_index=True,
+                use_container_width=True,
+                key=last_search['table_key']
+            )
+            
+            selected_rows = event.selection.rows
+            if not selected_rows:
+                st.caption("Showing the first result. Select a row to view its matches.")
+            idx = selected_rows[0] if selected_rows else 0
+            row = records[idx]
+            
+            display_title = row.get('MEETING_TITLE') if pd.notna(row.get('MEETING_TITLE')) else row['FILE_NAME']
+            account_str = f" · {row['ACCOUNT_NAME']}" if pd.notna(row.get('ACCOUNT_NAME')) else ""
+            date_str = str(row['CALL_START_TS'])[:10] if pd.notna(row.get('CALL_START_TS')) else str(row['TRANSCRIPTION_TIMESTAMP'])[:10]
+            snippet = row['SNIPPET']
+            st.markdown(f"""
+            <div class="search-result">
+                <h4>📄 {html.escape(display_title + account_str)}</h4>
+                <p><strong>Date:</strong> {date_str} | 
+                   <strong>Type:</strong> {html.escape(str(row['FILE_TYPE']))} | 
+                   <strong>Language:</strong> {html.escape(str(row['DETECTED_LANGUAGE']))} | 
+                   <strong>Speakers:</strong> {row.get('SPEAKER_COUNT', 'N/A')} |
+                   <strong>Duration:</strong> {row['AUDIO_DURATION_SECONDS']:.1f}s</p>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            if show_speaker_view and row['HAS_SPEAKERS']:
+                # Show speaker-based results with context
+                try:
+                    speaker_segments = get_speaker_segments(session, row['FILE_NAME'])
+                    
+                    if speaker_segments:
+                        # Find matching segments with context
+                        context_segments = find_matching_segments_with_context(
+                            speaker_segments, search_term, context_size
+                        )
+                        
+                        if context_segments:
+                            file_info = {
+                                'filename': row['FILE_NAME'],
+                                'language': row['DETECTED_LANGUAGE'],
+                                'duration': row['AUDIO_DURATION_SECONDS'],
+                                'speaker_count': row.get('SPEAKER_COUNT', 'N/A')
+                            }
+                            
+                            # Create export button for search results
+                            col1, col2 = st.columns([3, 1])
+                            
+                            with col1:
+                                expander_label = "🎯 View Matches with Context"
+                            
+                            with col2:
+                                # Exports are only built for results the user asks for
+                                if row['FILE_NAME'] not in last_search['exports']:
+                                    if st.button("📥 Prepare export", key=f"prepare_{idx}_{row['FILE_NAME']}"):
+                                        last_search['exports'].add(row['FILE_NAME'])
+                                
+                                if row['FILE_NAME'] in last_search['exports']:
+                                    # Create CSV for search results
+                                    search_csv_string = convert_search_results_to_csv(context_segments, file_info, search_term)
+                                    search_srt_content_with_speakers = convert_search_results_to_srt(context_segments, file_info, search_term, include_speakers=True)
+                                    search_srt_content_no_speakers = convert_search_results_to_srt(context_segments, file_info, search_term, include_speakers=False)
+                                
+                                    # Clean filename for downloads
+                                    clean_filename = FILENAME_UNSAFE_RE.sub('_', row['FILE_NAME'])
+                                    clean_search_term = SEARCH_TERM_UNSAFE_RE.sub('_', search_term)
+                                
+                                    # Export buttons in mini columns
+                                    btn_col1, btn_col2, btn_col3 = st.columns(3)
+                                
+                                    with btn_col1:
+                                        if search_csv_string is not None:
+                                            search_csv_filename = f"search_{clean_search_term}_{clean_filename}.csv"
+                                        
+                                            st.download_button(
+                                                label="📊 CSV",
+                                                data=search_csv_string,
+                                                file_name=search_csv_filename,
+                                                mime="text/csv",
+                                                help="Export as CSV",
+                                                key=f"csv_{idx}_{row['FILE_NAME']}"
+                                            )
+                                
+                                    with btn_col2:
+                                        if search_srt_content_with_speakers:
+                                            search_srt_filename = f"search_{clean_search_term}_{clean_filename}.srt"
+                                        
+                                            st.download_button(
+                                                label="🎬 SRT (w/ Speakers)",
+                                                data=search_srt_content_with_speakers,
+                                                file_name=search_srt_filename,
+                                                mime="application/x-subrip",
+                                                help="Export as SRT with speaker labels",
+                                                key=f"srt_speakers_{idx}_{row['FILE_NAME']}"
+                                            )
+                                
+                                    with btn_col3:
+                                        if search_srt_content_no_speakers:
+                                            search_srt_filename_no_speakers = f"search_{clean_search_term}_{clean_filename}_no_speakers.srt"
+                                        
+                                            st.download_button(
+                                                label="🎬 SRT (no Speakers)",
+                                                data=search_srt_content_no_speakers,
+                                                file_name=search_srt_filename_no_speakers,
+                                                mime="application/x-subrip",
+                                                help="Export as SRT without speaker labels",
+                                                key=f"srt_no_speakers_{idx}_{row['FILE_NAME']}"
+                                            )
+                            
+                            with st.expander(expander_label, expanded=True):
+                                display_search_result_with_speakers(context_segments, search_term, file_info)
+                        else:
+                            # Fallback to regular transcript if no speaker matches found
+                            transcript = snippet
+                            highlighted_transcript = highlight_text(transcript, search_term)
+                            
+                            with st.expander("View Transcript"):
+                                st.markdown(highlighted_transcript, unsafe_allow_html=True)
+                    else:
+                        # No speaker segments available
+                        transcript = snippet
+                        highlighted_transcript = highlight_text(transcript, search_term)
+                        
+                        with st.expander("View Transcript"):
+                            st.markdown(highlighted_transcript, unsafe_allow_html=True)
+                            
+                except Exception as e:
+                    st.error(f"Error processing speaker data: {e}")
+                    # Fallback to regular transcript
+                    transcript = snippet
+                    highlighted_transcript = highlight_text(transcript, search_term)
+                    
+                    with st.expander("View Transcript"):
+                        st.markdown(highlighted_transcript, unsafe_allow_html=True)
+            else:
+                # Show regular transcript view
+                transcript = snippet
+                highlighted_transcript = highlight_text(transcript, search_term)
+                
+                with st.expander("View Transcript"):
+                    st.markdown(highlighted_transcript, unsafe_allow_html=True)
+        else:
+            st.info("No results found for your search criteria.")
+
+@st.fragment
+def render_speaker_tab(session, df, transcript_as_table=False):
+    """Speaker View tab; runs as a fragment so its widgets only rerun this tab"""
+    st.header("👥 Speaker-by-Speaker Transcripts")
+    
+    # File selection — show meeting title when available, fall back to file name
+    speaker_files = get_speaker_file_options(df, dataset_key(df))
+    
+    if not speaker_files['has_speakers']:
+        st.markdown("""
+        <div class="info-box">
+            <h4>ℹ️ No files with speaker data found</h4>
+            <p>Speaker diarization data is not available for the current dataset. 
+            Files will still show structured segments based on timing.</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    display_labels = speaker_files['labels']
+    label_to_filename = speaker_files['label_to_filename']
+
+    selected_label = st.selectbox(
+        "Select a meeting to view:",
+        options=display_labels,
+        index=0 if display_labels else None
+    )
+    selected_file = label_to_filename.get(selected_label) if selected_label else None
+    
+    if selected_file:
+        # Get file metadata
+        file_row = df.loc[[selected_file]].iloc[0]
+        file_detail = load_transcript_detail(session, selected_file)
+        
+        # Display file info and export controls
+        col1, col2, col3, col4, col5, col6 = st.columns([1, 1, 1, 1, 1, 2])
+        with col1:
+            st.metric("File Type", file_row['FILE_TYPE'])
+        with col2:
+            st.metric("Language", file_row['DETECTED_LANGUAGE'])
+        with col3:
+            duration = file_row['AUDIO_DURATION_SECONDS']
+            st.metric("Duration", f"{duration:.1f}s" if pd.notna(duration) else "N/A")
+        with col4:
+            speakers = file_row.get('SPEAKER_COUNT', 0)
+            st.metric("Speakers", f"{speakers}" if speakers > 0 else "N/A")
+        with col5:
+            account_val = file_row.get('ACCOUNT_NAME')
+            st.metric("Account", account_val if pd.notna(account_val) else "—")
+        with col6:
+            # Export button
+            st.markdown("**📥 Export Options:**")
+            
+            # Clean filename for download
+            clean_filename = FILENAME_UNSAFE_RE.sub('_', selected_file)
+            
+            # Get pre-computed content from database
+            srt_content = file_detail.get('SRT_CONTENT')
+            srt_with_speakers = file_detail.get('SRT_WITH_SPEAKERS')
+            summary_markdown = file_detail.get('SUMMARY_MARKDOWN')
+            
+            # Export buttons in columns - now with 4 columns for markdown
+            export_col1, export_col2, export_col3, export_col4 = st.columns(4)
+            
+            with export_col1:
+                # Use pre-computed SRT without speakers
+                if srt_content and pd.notna(srt_content):
+                    srt_filename = f"transcript_{clean_filename}.srt"
+                    st.download_button(
+                        label="📥 SRT",
+                        data=srt_content,
+                        file_name=srt_filename,
+                        mime="application/x-subrip",
+                        help="Download as SRT subtitles"
+                    )
+                else:
+                    st.caption("SRT N/A")
+            
+            with export_col2:
+                # Use pre-computed SRT with speakers
+                if srt_with_speakers and pd.notna(srt_with_speakers):
+                    srt_filename_speakers = f"transcript_{clean_filename}_speakers.srt"
+                    st.download_button(
+                        label="📥 SRT+",
+                        data=srt_with_speakers,
+                        file_name=srt_filename_speakers,
+                        mime="application/x-subrip",
+                        help="Download as SRT with speaker labels"
+                    )
+                else:
+                    st.caption("SRT+ N/A")
+            
+            with export_col3:
+                # Markdown summary download
+                if summary_markdown and pd.notna(summary_markdown):
+                    md_filename = f"summary_{clean_filename}.md"
+                    st.download_button(
+                        label="📥 Summary",
+                        data=summary_markdown,
+                        file_name=md_filename,
+                        mime="text/markdown",
+                        help="Download AI-generated summary"
+                    )
+                else:
+                    st.caption("Summary N/A")
+            
+            with export_col4:
+                # CSV export (still dynamically generated from speaker segments)
+                speaker_segments = get_speaker_segments(session, selected_file)
+                if speaker_segments:
+                    file_info = {
+                        'filename': selected_file,
+                        'duration': file_row['AUDIO_DURATION_SECONDS'],
+                        'language': file_row['DETECTED_LANGUAGE']
+                    }
+                    csv_string = convert_speaker_segments_to_csv(speaker_segments, file_info)
+                    if csv_string is not None:
+                        download_filename = f"transcript_{clean_filename}.csv"
+                        st.download_button(
+                            label="📥 CSV",
+                            data=csv_string,
+                            file_name=download_filename,
+                            mime="text/csv",
+                            help="Download as CSV spreadsheet"
+                        )
+                    else:
+                        st.caption("CSV N/A")
+                else:
+                    st.caption("CSV N/A")
+        
+        # Summary / structured insights section
+        has_summary = summary_markdown and pd.notna(summary_markdown)
+        key_points = file_detail.get('KEY_POINTS')
+        next_steps = file_detail.get('NEXT_STEPS')
+        decisions = file_detail.get('DECISIONS_MADE')
+        questions = file_detail.get('QUESTIONS_RAISED')
+        has_structured = any(pd.notna(v) and v for v in [key_points, next_steps, decisions, questions])
+
+        if has_summary or has_structured:
+            with st.expander("📋 Meeting Summary & Insights", expanded=False):
+                if has_structured:
+                    scol1, scol2 = st.columns(2)
+                    with scol1:
+                        if pd.notna(key_points) and key_points:
+                            st.markdown("**Key Points**")
+                            st.markdown(key_points if isinstance(key_points, str) else str(key_points))
+                        if pd.notna(decisions) and decisions:
+                            st.markdown("**Decisions Made**")
+                            st.markdown(decisions if isinstance(decisions, str) else str(decisions))
+                    with scol2:
+                        if pd.notna(next_steps) and next_steps:
+                            st.markdown("**Next Steps**")
+                            st.markdown(next_steps if isinstance(next_steps, str) else str(next_steps))
+                        if pd.notna(questions) and questions:
+                            st.markdown("**Questions Raised**")
+                            st.markdown(questions if isinstance(questions, str) else str(questions))
+                    if has_summary:
+                        st.divider()
+                if has_summary:
+                    st.markdown("**Full Summary**")
+                    st.markdown(summary_markdown)
+        
+        st.divider()
+        
+        # Load and display speaker segments
+        speaker_segments = get_speaker_segments(session, selected_file)
+        
+        if speaker_segments:
+            st.subheader("📝 Transcript with Speaker Segments")
+            
+            # Get file info from first segment if available
+            file_info = None
+            if speaker_segments and isinstance(speaker_segments, list) and len(speaker_segments) > 0:
+                # If we have speaker data, the file_info might be in the original JSON
+                # For now, we'll create it from our DataFrame
+                file_info = {
+                    'filename': selected_file,
+                    'duration': file_row['AUDIO_DURATION_SECONDS'],
+                    'language': file_row['DETECTED_LANGUAGE']
+                }
+            
+            display_speaker_transcript(speaker_segments, file_info, as_table=transcript_as_table)
+            
+        else:
+            # Fallback: show basic transcript
+            st.subheader("📝 Basic Transcript")
+            st.info("Speaker segments not available. Showing full transcript:")
+            
+            transcript = file_detail.get('TRANSCRIPT')
+            st.markdown(f"""
+            <div class="transcript-box">
+                <p>{html.escape(str(transcript))}</p>
+            </div>
+            """, unsafe_allow_html=True)
+
 def main():
+    # Streamlit drops any element a rerun does not re-emit, so the styles go out every run
+    st.markdown(_CSS, unsafe_allow_html=True)
     st.title("🎵 Audio/Video Transcription Dashboard")
     st.markdown("Explore and analyze your transcribed audio and video files")
     
@@ -837,9 +1256,20 @@ def main():
         st.subheader("Data Loading")
         data_limit = st.selectbox("Number of records to load:", [100, 500, 1000, 2000], index=2)
         if st.button("🔄 Refresh Data"):
-            # Clear any cached data that depends on the session
-            st.cache_data.clear()
+            # Drop every cached Snowflake query; caches keyed by dataset_key follow the reload
+            for cached_query in (_query_transcription_data, _query_summary_stats, _query_page,
+                                 _query_transcript_detail, _query_speaker_segments, _query_speaker_segments_bulk):
+                cached_query.clear()
             st.rerun()
+        
+        st.subheader("Display")
+        transcript_mode = st.radio(
+            "Transcript display mode:",
+            ["Rich", "Table"],
+            horizontal=True,
+            help="Table mode renders long transcripts faster"
+        )
+        transcript_as_table = transcript_mode == "Table"
     
     # Load main dataset
     df = load_transcription_data(session, data_limit)
@@ -855,6 +1285,8 @@ def main():
     
     # Get summary stats
     stats = get_summary_stats(session)
+    df_key = dataset_key(df)
+    filter_options = get_filter_options(df, df_key)
     
     # Main dashboard tabs
     tab1, tab2, tab3, tab4, tab5 = st.tabs(["📈 Overview", "🔍 Search", "👥 Speaker View", "📊 Analytics", "📋 Browse Data"])
@@ -862,38 +1294,32 @@ def main():
     with tab1:
         st.header("Overview")
         
-        # Key metrics
-        col1, col2, col3, col4, col5, col6 = st.columns(6)
-        
-        with col1:
-            st.metric("Total Files", f"{stats.get('total_files', 0):,}")
-        
-        with col2:
-            hours = stats.get('total_duration', 0)
-            st.metric("Total Audio Hours", f"{hours:.1f}")
-        
-        with col3:
-            st.metric("Accounts", f"{stats.get('account_count', 0)}")
-            
-        with col4:
-            st.metric("Languages Detected", f"{stats.get('languages', 0)}")
-        
-        with col5:
-            st.metric("Files with Speakers", f"{stats.get('files_with_speakers', 0)}")
-        
-        with col6:
-            avg_speakers = stats.get('avg_speakers', 0)
-            st.metric("Avg Speakers", f"{avg_speakers:.1f}")
+        # Key metrics, sent as a single element instead of six columns of st.metric
+        metrics = [
+            ("Total Files", f"{stats.get('total_files', 0):,}"),
+            ("Total Audio Hours", f"{stats.get('total_duration', 0):.1f}"),
+            ("Accounts", f"{stats.get('account_count', 0)}"),
+            ("Languages Detected", f"{stats.get('languages', 0)}"),
+            ("Files with Speakers", f"{stats.get('files_with_speakers', 0)}"),
+            ("Avg Speakers", f"{stats.get('avg_speakers', 0):.1f}")
+        ]
+        metric_cells = "".join(
+            f'<div class="metric-container"><div class="metric-label">{label}</div><div class="metric-value">{value}</div></div>'
+            for label, value in metrics
+        )
+        st.markdown(f'<div class="metric-grid">{metric_cells}</div>', unsafe_allow_html=True)
         
         st.divider()
         
+        overview = get_overview_aggregates(df, df_key)
+        
         # Top accounts chart + file types side by side
         col1, col2 = st.columns(2)
 
         with col1:
             st.subheader("Meetings by Account")
             if not df.empty:
-                account_counts = df[df['ACCOUNT_NAME'].notna()]['ACCOUNT_NAME'].value_counts().head(10)
+                account_counts = overview['accounts']
                 if not account_counts.empty:
                     st.bar_chart(account_counts)
                 else:
@@ -902,7 +1328,7 @@ def main():
         with col2:
             st.subheader("File Types")
             if not df.empty:
-                st.bar_chart(df['FILE_TYPE'].value_counts())
+                st.bar_chart(overview['file_types'])
 
         st.divider()
 
@@ -912,424 +1338,37 @@ def main():
         with col1:
             st.subheader("Processing Timeline")
             if not df.empty:
-                # Create timeline chart
-                df['DATE'] = pd.to_datetime(df['TRANSCRIPTION_TIMESTAMP']).dt.date
-                timeline_data = df.groupby('DATE').size().reset_index(name='Files Processed')
-                
                 # Use Streamlit's built-in line chart
-                st.line_chart(timeline_data.set_index('DATE')['Files Processed'])
+                st.line_chart(overview['timeline'])
         
         # Language distribution
         st.subheader("Language Distribution")
         if not df.empty:
-            lang_counts = df['DETECTED_LANGUAGE'].value_counts().head(10)
-            st.bar_chart(lang_counts)
+            st.bar_chart(overview['languages'])
         
         # Recent files table
         st.subheader("Recent Transcriptions")
         if not df.empty:
-            recent_df = df.head(5).copy()
-            recent_df['DISPLAY_TITLE'] = recent_df['MEETING_TITLE'].where(recent_df['MEETING_TITLE'].notna(), recent_df['FILE_NAME'])
+            recent_df = df.head(5)
             st.dataframe(
-                recent_df[['DISPLAY_TITLE', 'ACCOUNT_NAME', 'CALL_START_TS', 'DETECTED_LANGUAGE', 'SPEAKER_COUNT']].rename(columns={
+                recent_df.assign(
+                    DISPLAY_TITLE=recent_df['MEETING_TITLE'].where(recent_df['MEETING_TITLE'].notna(), recent_df['FILE_NAME'])
+                )[['DISPLAY_TITLE', 'ACCOUNT_NAME', 'CALL_START_TS', 'DETECTED_LANGUAGE', 'SPEAKER_COUNT']].rename(columns={
                     'DISPLAY_TITLE': 'Meeting',
                     'ACCOUNT_NAME': 'Account',
                     'CALL_START_TS': 'Date',
                     'DETECTED_LANGUAGE': 'Language',
                     'SPEAKER_COUNT': 'Speakers',
                 }),
-                use_container_width=True
+                use_container_width=True,
+                hide_index=True
             )
     
     with tab2:
-        st.header("🔍 Search Transcriptions")
-        
-        # Search controls
-        col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
-        
-        with col1:
-            search_term = st.text_input("Search in transcripts:", placeholder="Enter keywords to search...")
-        
-        with col2:
-            file_types = ["All"] + sorted(df['FILE_TYPE'].unique().tolist())
-            selected_file_type = st.selectbox("File Type:", file_types)
-        
-        with col3:
-            languages = ["All"] + sorted(df['DETECTED_LANGUAGE'].unique().tolist())
-            selected_language = st.selectbox("Language:", languages)
-
-        with col4:
-            accounts = ["All"] + sorted(df['ACCOUNT_NAME'].dropna().unique().tolist())
-            selected_account = st.selectbox("Account:", accounts)
-        
-        # Additional search options
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            start_date = st.date_input("From date:", value=datetime.now().date() - timedelta(days=30))
-        with col2:
-            end_date = st.date_input("To date:", value=datetime.now().date())
-        with col3:
-            context_size = st.number_input(
-                "Context messages:", 
-                min_value=0, 
-                max_value=50, 
-                value=10,
-                help="Number of messages before and after each match to show for context"
-            )
-        
-        # Search options
-        col1, col2 = st.columns([1, 3])
-        with col1:
-            show_speaker_view = st.checkbox("Show speaker segments", value=True, help="Display results with speaker-by-speaker breakdown")
-        with col2:
-            st.markdown("") # Spacer
-        
-        # Search execution
-        if st.button("🔍 Search", type="primary") and search_term:
-            with st.spinner("Searching transcriptions..."):
-                search_results = search_transcriptions(
-                    session, search_term, 
-                    selected_file_type if selected_file_type != "All" else None,
-                    selected_language if selected_language != "All" else None,
-                    (start_date, end_date),
-                    selected_account if selected_account != "All" else None
-                )
-            
-            st.subheader(f"Search Results ({len(search_results)} found)")
-            
-            if not search_results.empty:
-                for idx, row in search_results.iterrows():
-                    display_title = row.get('MEETING_TITLE') if pd.notna(row.get('MEETING_TITLE')) else row['FILE_NAME']
-                    account_str = f" · {row['ACCOUNT_NAME']}" if pd.notna(row.get('ACCOUNT_NAME')) else ""
-                    date_str = str(row['CALL_START_TS'])[:10] if pd.notna(row.get('CALL_START_TS')) else str(row['TRANSCRIPTION_TIMESTAMP'])[:10]
-                    with st.container():
-                        st.markdown(f"""
-                        <div class="search-result">
-                            <h4>📄 {display_title}{account_str}</h4>
-                            <p><strong>Date:</strong> {date_str} | 
-                               <strong>Type:</strong> {row['FILE_TYPE']} | 
-                               <strong>Language:</strong> {row['DETECTED_LANGUAGE']} | 
-                               <strong>Speakers:</strong> {row.get('SPEAKER_COUNT', 'N/A')} |
-                               <strong>Duration:</strong> {row['AUDIO_DURATION_SECONDS']:.1f}s</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                        
-                        if show_speaker_view and row.get('TRANSCRIPT_WITH_SPEAKERS') is not None:
-                            # Show speaker-based results with context
-                            try:
-                                # Parse speaker data
-                                transcript_data = row['TRANSCRIPT_WITH_SPEAKERS']
-                                if isinstance(transcript_data, str):
-                                    transcript_data = json.loads(transcript_data)
-                                
-                                speaker_segments = transcript_data.get('speakers', [])
-                                
-                                if speaker_segments:
-                                    # Find matching segments with context
-                                    context_segments = find_matching_segments_with_context(
-                                        speaker_segments, search_term, context_size
-                                    )
-                                    
-                                    if context_segments:
-                                        file_info = {
-                                            'filename': row['FILE_NAME'],
-                                            'language': row['DETECTED_LANGUAGE'],
-                                            'duration': row['AUDIO_DURATION_SECONDS'],
-                                            'speaker_count': row.get('SPEAKER_COUNT', 'N/A')
-                                        }
-                                        
-                                        # Create export button for search results
-                                        col1, col2 = st.columns([3, 1])
-                                        
-                                        with col1:
-                                            expander_label = "🎯 View Matches with Context"
-                                        
-                                        with col2:
-                                            # Create CSV for search results
-                                            search_csv_df = convert_search_results_to_csv(context_segments, file_info, search_term)
-                                            search_srt_content_with_speakers = convert_search_results_to_srt(context_segments, file_info, search_term, include_speakers=True)
-                                            search_srt_content_no_speakers = convert_search_results_to_srt(context_segments, file_info, search_term, include_speakers=False)
-                                            
-                                            # Clean filename for downloads
-                                            clean_filename = re.sub(r'[^\w\-_\.]', '_', row['FILE_NAME'])
-                                            clean_search_term = re.sub(r'[^\w\-_]', '_', search_term)
-                                            
-                                            # Export buttons in mini columns
-                                            btn_col1, btn_col2, btn_col3 = st.columns(3)
-                                            
-                                            with btn_col1:
-                                                if search_csv_df is not None:
-                                                    search_csv_string = create_csv_download(search_csv_df, row['FILE_NAME'])
-                                                    search_csv_filename = f"search_{clean_search_term}_{clean_filename}.csv"
-                                                    
-                                                    st.download_button(
-                                                        label="📊 CSV",
-                                                        data=search_csv_string,
-                                                        file_name=search_csv_filename,
-                                                        mime="text/csv",
-                                                        help="Export as CSV",
-                                                        key=f"csv_{idx}_{row['FILE_NAME']}"
-                                                    )
-                                            
-                                            with btn_col2:
-                                                if search_srt_content_with_speakers:
-                                                    search_srt_filename = f"search_{clean_search_term}_{clean_filename}.srt"
-                                                    
-                                                    st.download_button(
-                                                        label="🎬 SRT (w/ Speakers)",
-                                                        data=search_srt_content_with_speakers,
-                                                        file_name=search_srt_filename,
-                                                        mime="application/x-subrip",
-                                                        help="Export as SRT with speaker labels",
-                                                        key=f"srt_speakers_{idx}_{row['FILE_NAME']}"
-                                                    )
-                                            
-                                            with btn_col3:
-                                                if search_srt_content_no_speakers:
-                                                    search_srt_filename_no_speakers = f"search_{clean_search_term}_{clean_filename}_no_speakers.srt"
-                                                    
-                                                    st.download_button(
-                                                        label="🎬 SRT (no Speakers)",
-                                                        data=search_srt_content_no_speakers,
-                                                        file_name=search_srt_filename_no_speakers,
-                                                        mime="application/x-subrip",
-                                                        help="Export as SRT without speaker labels",
-                                                        key=f"srt_no_speakers_{idx}_{row['FILE_NAME']}"
-                                                    )
-                                        
-                                        with st.expander(expander_label, expanded=True):
-                                            display_search_result_with_speakers(context_segments, search_term, file_info)
-                                    else:
-                                        # Fallback to regular transcript if no speaker matches found
-                                        transcript = str(row['TRANSCRIPT'])[:500] + "..." if len(str(row['TRANSCRIPT'])) > 500 else str(row['TRANSCRIPT'])
-                                        highlighted_transcript = highlight_text(transcript, search_term)
-                                        
-                                        with st.expander("View Transcript"):
-                                            st.markdown(highlighted_transcript)
-                                else:
-                                    # No speaker segments available
-                                    transcript = str(row['TRANSCRIPT'])[:500] + "..." if len(str(row['TRANSCRIPT'])) > 500 else str(row['TRANSCRIPT'])
-                                    highlighted_transcript = highlight_text(transcript, search_term)
-                                    
-                                    with st.expander("View Transcript"):
-                                        st.markdown(highlighted_transcript)
-                                        
-                            except Exception as e:
-                                st.error(f"Error processing speaker data: {e}")
-                                # Fallback to regular transcript
-                                transcript = str(row['TRANSCRIPT'])[:500] + "..." if len(str(row['TRANSCRIPT'])) > 500 else str(row['TRANSCRIPT'])
-                                highlighted_transcript = highlight_text(transcript, search_term)
-                                
-                                with st.expander("View Transcript"):
-                                    st.markdown(highlighted_transcript)
-                        else:
-                            # Show regular transcript view
-                            transcript = str(row['TRANSCRIPT'])[:500] + "..." if len(str(row['TRANSCRIPT'])) > 500 else str(row['TRANSCRIPT'])
-                            highlighted_transcript = highlight_text(transcript, search_term)
-                            
-                            with st.expander("View Transcript"):
-                                st.markdown(highlighted_transcript)
-                        
-                        st.divider()
-            else:
-                st.info("No results found for your search criteria.")
-        elif search_term == "":
-            st.warning("Please enter a search term.")
+        render_search_tab(session, filter_options)
     
     with tab3:
-        st.header("👥 Speaker-by-Speaker Transcripts")
-        
-        # File selection — show meeting title when available, fall back to file name
-        files_with_speakers = df[df['SPEAKER_COUNT'] > 0].copy()
-        
-        if files_with_speakers.empty:
-            st.markdown("""
-            <div class="info-box">
-                <h4>ℹ️ No files with speaker data found</h4>
-                <p>Speaker diarization data is not available for the current dataset. 
-                Files will still show structured segments based on timing.</p>
-            </div>
-            """, unsafe_allow_html=True)
-            files_with_speakers = df.head(10).copy()
-
-        files_with_speakers['DISPLAY_LABEL'] = files_with_speakers['MEETING_TITLE'].where(
-            files_with_speakers['MEETING_TITLE'].notna(), files_with_speakers['FILE_NAME']
-        )
-        label_to_filename = dict(zip(files_with_speakers['DISPLAY_LABEL'], files_with_speakers['FILE_NAME']))
-        display_labels = files_with_speakers['DISPLAY_LABEL'].tolist()
-
-        selected_label = st.selectbox(
-            "Select a meeting to view:",
-            options=display_labels,
-            index=0 if display_labels else None
-        )
-        selected_file = label_to_filename.get(selected_label) if selected_label else None
-        
-        if selected_file:
-            # Get file metadata
-            file_row = df[df['FILE_NAME'] == selected_file].iloc[0]
-            
-            # Display file info and export controls
-            col1, col2, col3, col4, col5, col6 = st.columns([1, 1, 1, 1, 1, 2])
-            with col1:
-                st.metric("File Type", file_row['FILE_TYPE'])
-            with col2:
-                st.metric("Language", file_row['DETECTED_LANGUAGE'])
-            with col3:
-                duration = file_row['AUDIO_DURATION_SECONDS']
-                st.metric("Duration", f"{duration:.1f}s" if pd.notna(duration) else "N/A")
-            with col4:
-                speakers = file_row.get('SPEAKER_COUNT', 0)
-                st.metric("Speakers", f"{speakers}" if speakers > 0 else "N/A")
-            with col5:
-                account_val = file_row.get('ACCOUNT_NAME')
-                st.metric("Account", account_val if pd.notna(account_val) else "—")
-            with col6:
-                # Export button
-                st.markdown("**📥 Export Options:**")
-                
-                # Clean filename for download
-                clean_filename = re.sub(r'[^\w\-_\.]', '_', selected_file)
-                
-                # Get pre-computed content from database
-                srt_content = file_row.get('SRT_CONTENT')
-                srt_with_speakers = file_row.get('SRT_WITH_SPEAKERS')
-                summary_markdown = file_row.get('SUMMARY_MARKDOWN')
-                
-                # Export buttons in columns - now with 4 columns for markdown
-                export_col1, export_col2, export_col3, export_col4 = st.columns(4)
-                
-                with export_col1:
-                    # Use pre-computed SRT without speakers
-                    if srt_content and pd.notna(srt_content):
-                        srt_filename = f"transcript_{clean_filename}.srt"
-                        st.download_button(
-                            label="📥 SRT",
-                            data=srt_content,
-                            file_name=srt_filename,
-                            mime="application/x-subrip",
-                            help="Download as SRT subtitles"
-                        )
-                    else:
-                        st.caption("SRT N/A")
-                
-                with export_col2:
-                    # Use pre-computed SRT with speakers
-                    if srt_with_speakers and pd.notna(srt_with_speakers):
-                        srt_filename_speakers = f"transcript_{clean_filename}_speakers.srt"
-                        st.download_button(
-                            label="📥 SRT+",
-                            data=srt_with_speakers,
-                            file_name=srt_filename_speakers,
-                            mime="application/x-subrip",
-                            help="Download as SRT with speaker labels"
-                        )
-                    else:
-                        st.caption("SRT+ N/A")
-                
-                with export_col3:
-                    # Markdown summary download
-                    if summary_markdown and pd.notna(summary_markdown):
-                        md_filename = f"summary_{clean_filename}.md"
-                        st.download_button(
-                            label="📥 Summary",
-                            data=summary_markdown,
-                            file_name=md_filename,
-                            mime="text/markdown",
-                            help="Download AI-generated summary"
-                        )
-                    else:
-                        st.caption("Summary N/A")
-                
-                with export_col4:
-                    # CSV export (still dynamically generated from speaker segments)
-                    speaker_segments = get_speaker_segments(session, selected_file)
-                    if speaker_segments:
-                        file_info = {
-                            'filename': selected_file,
-                            'duration': file_row['AUDIO_DURATION_SECONDS'],
-                            'language': file_row['DETECTED_LANGUAGE']
-                        }
-                        csv_df = convert_speaker_segments_to_csv(speaker_segments, file_info)
-                        if csv_df is not None:
-                            csv_string = create_csv_download(csv_df, selected_file)
-                            download_filename = f"transcript_{clean_filename}.csv"
-                            st.download_button(
-                                label="📥 CSV",
-                                data=csv_string,
-                                file_name=download_filename,
-                                mime="text/csv",
-                                help="Download as CSV spreadsheet"
-                            )
-                        else:
-                            st.caption("CSV N/A")
-                    else:
-                        st.caption("CSV N/A")
-            
-            # Summary / structured insights section
-            has_summary = summary_markdown and pd.notna(summary_markdown)
-            key_points = file_row.get('KEY_POINTS')
-            next_steps = file_row.get('NEXT_STEPS')
-            decisions = file_row.get('DECISIONS_MADE')
-            questions = file_row.get('QUESTIONS_RAISED')
-            has_structured = any(pd.notna(v) and v for v in [key_points, next_steps, decisions, questions])
-
-            if has_summary or has_structured:
-                with st.expander("📋 Meeting Summary & Insights", expanded=False):
-                    if has_structured:
-                        scol1, scol2 = st.columns(2)
-                        with scol1:
-                            if pd.notna(key_points) and key_points:
-                                st.markdown("**Key Points**")
-                                st.markdown(key_points if isinstance(key_points, str) else str(key_points))
-                            if pd.notna(decisions) and decisions:
-                                st.markdown("**Decisions Made**")
-                                st.markdown(decisions if isinstance(decisions, str) else str(decisions))
-                        with scol2:
-                            if pd.notna(next_steps) and next_steps:
-                                st.markdown("**Next Steps**")
-                                st.markdown(next_steps if isinstance(next_steps, str) else str(next_steps))
-                            if pd.notna(questions) and questions:
-                                st.markdown("**Questions Raised**")
-                                st.markdown(questions if isinstance(questions, str) else str(questions))
-                        if has_summary:
-                            st.divider()
-                    if has_summary:
-                        st.markdown("**Full Summary**")
-                        st.markdown(summary_markdown)
-            
-            st.divider()
-            
-            # Load and display speaker segments
-            speaker_segments = get_speaker_segments(session, selected_file)
-            
-            if speaker_segments:
-                st.subheader("📝 Transcript with Speaker Segments")
-                
-                # Get file info from first segment if available
-                file_info = None
-                if speaker_segments and isinstance(speaker_segments, list) and len(speaker_segments) > 0:
-                    # If we have speaker data, the file_info might be in the original JSON
-                    # For now, we'll create it from our DataFrame
-                    file_info = {
-                        'filename': selected_file,
-                        'duration': file_row['AUDIO_DURATION_SECONDS'],
-                        'language': file_row['DETECTED_LANGUAGE']
-                    }
-                
-                display_speaker_transcript(speaker_segments, file_info)
-                
-            else:
-                # Fallback: show basic transcript
-                st.subheader("📝 Basic Transcript")
-                st.info("Speaker segments not available. Showing full transcript:")
-                
-                transcript = file_row['TRANSCRIPT']
-                st.markdown(f"""
-                <div class="transcript-box">
-                    <p>{transcript}</p>
-                </div>
-                """, unsafe_allow_html=True)
+        render_speaker_tab(session, df, transcript_as_table)
     
     with tab4:
         st.header("📊 Analytics")
@@ -1347,8 +1386,7 @@ def main():
             
             with col2:
                 st.subheader("File Size Distribution")
-                df['FILE_SIZE_MB'] = df['FILE_SIZE_BYTES'] / (1024 * 1024)
-                st.bar_chart(df['FILE_SIZE_MB'].value_counts().head(20))
+                st.bar_chart(histogram_series(df['FILE_SIZE_MB'], decimals=1))
             
             # Speaker analysis
             col1, col2 = st.columns(2)
@@ -1371,31 +1409,19 @@ def main():
             
             # Processing efficiency by file type
             st.subheader("Processing Efficiency by File Type")
-            efficiency_data = df.groupby('FILE_TYPE').agg({
-                'PROCESSING_TIME_SECONDS': 'mean',
-                'AUDIO_DURATION_SECONDS': 'mean'
-            }).reset_index()
-            
-            efficiency_data['PROCESSING_RATIO'] = (
-                efficiency_data['PROCESSING_TIME_SECONDS'] / 
-                efficiency_data['AUDIO_DURATION_SECONDS']
-            )
-            
-            st.bar_chart(efficiency_data.set_index('FILE_TYPE')['PROCESSING_RATIO'])
+            analytics = get_analytics_aggregates(df, df_key)
+            st.bar_chart(analytics['efficiency'])
             st.info("Lower ratios indicate better efficiency (faster than real-time processing)")
             
             # Word count analysis
             st.subheader("Transcript Length Analysis")
-            df['WORD_COUNT'] = df['TRANSCRIPT'].astype(str).str.split().str.len()
-            
             col1, col2 = st.columns(2)
             
             with col1:
-                st.bar_chart(df['WORD_COUNT'].value_counts().head(20))
+                st.bar_chart(histogram_series(df['WORD_COUNT']))
             
             with col2:
-                avg_words_by_lang = df.groupby('DETECTED_LANGUAGE')['WORD_COUNT'].mean().sort_values(ascending=False).head(10)
-                st.bar_chart(avg_words_by_lang)
+                st.bar_chart(analytics['words_by_language'])
     
     with tab5:
         st.header("📋 Browse All Data")
@@ -1404,102 +1430,98 @@ def main():
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            filter_file_type = st.selectbox("Filter by File Type:", ["All"] + sorted(df['FILE_TYPE'].unique()))
+            filter_file_type = st.selectbox("Filter by File Type:", ["All"] + filter_options['file_types'])
         
         with col2:
-            filter_language = st.selectbox("Filter by Language:", ["All"] + sorted(df['DETECTED_LANGUAGE'].unique()))
+            filter_language = st.selectbox("Filter by Language:", ["All"] + filter_options['languages'])
 
         with col3:
-            filter_accounts = ["All"] + sorted(df['ACCOUNT_NAME'].dropna().unique().tolist())
-            filter_account = st.selectbox("Filter by Account:", filter_accounts)
+            filter_account = st.selectbox("Filter by Account:", ["All"] + filter_options['accounts'])
         
         with col4:
-            sort_by = st.selectbox("Sort by:", ["TRANSCRIPTION_TIMESTAMP", "FILE_NAME", "SPEAKER_COUNT", "PROCESSING_TIME_SECONDS", "AUDIO_DURATION_SECONDS"])
-        
-        # Apply filters
-        filtered_df = df.copy()
-        
-        if filter_file_type != "All":
-            filtered_df = filtered_df[filtered_df['FILE_TYPE'] == filter_file_type]
-        
-        if filter_language != "All":
-            filtered_df = filtered_df[filtered_df['DETECTED_LANGUAGE'] == filter_language]
-
-        if filter_account != "All":
-            filtered_df = filtered_df[filtered_df['ACCOUNT_NAME'] == filter_account]
-        
-        # Sort
-        filtered_df = filtered_df.sort_values(sort_by, ascending=False)
-        
-        st.subheader(f"Showing {len(filtered_df)} records")
-        
-        # Display data with expandable transcripts
-        for idx, row in filtered_df.head(20).iterrows():  # Limit to 20 for performance
-            with st.container():
-                col1, col2, col3, col4, col5 = st.columns([3, 1, 1, 1, 1])
-                
-                with col1:
-                    display_title = row['MEETING_TITLE'] if pd.notna(row.get('MEETING_TITLE')) else row['FILE_NAME']
-                    account_str = f"  ·  {row['ACCOUNT_NAME']}" if pd.notna(row.get('ACCOUNT_NAME')) else ""
-                    date_str = f"  ·  {str(row['CALL_START_TS'])[:10]}" if pd.notna(row.get('CALL_START_TS')) else ""
-                    st.markdown(f"**{display_title}**{account_str}{date_str}")
-                
-                with col2:
-                    st.text(f"{row['FILE_TYPE']}")
-                
-                with col3:
-                    st.text(f"{row['DETECTED_LANGUAGE']}")
-                
-                with col4:
-                    speakers = row.get('SPEAKER_COUNT', 0)
-                    st.text(f"{speakers}" if speakers > 0 else "N/A")
-                
-                with col5:
-                    duration = row['AUDIO_DURATION_SECONDS']
-                    st.text(f"{duration:.1f}s" if pd.notna(duration) else "N/A")
-                
-                # Transcript preview
-                transcript = str(row['TRANSCRIPT'])
-                transcript_preview = transcript[:200] + "..." if len(transcript) > 200 else transcript
-                st.text(transcript_preview)
-                
-                # Full transcript in expander
-                with st.expander("View Full Transcript"):
-                    if row.get('SPEAKER_COUNT', 0) > 0:
-                        # Show speaker segments if available
-                        speaker_segments = get_speaker_segments(session, row['FILE_NAME'])
-                        if speaker_segments:
-                            st.markdown("**Speaker-separated transcript:**")
-                            display_speaker_transcript(speaker_segments)
-                        else:
-                            # Fallback to regular transcript
-                            st.markdown(f"""
-                            <div class="transcript-box">
-                                <p>{transcript}</p>
-                                <hr>
-                                <small>
-                                Processing time: {row['PROCESSING_TIME_SECONDS']:.2f}s | 
-                                Timestamp: {row['TRANSCRIPTION_TIMESTAMP']}
-                                </small>
-                            </div>
-                            """, unsafe_allow_html=True)
-                    else:
-                        # Regular transcript
-                        st.markdown(f"""
-                        <div class="transcript-box">
-                            <p>{transcript}</p>
-                            <hr>
-                            <small>
-                            Processing time: {row['PROCESSING_TIME_SECONDS']:.2f}s | 
-                            Timestamp: {row['TRANSCRIPTION_TIMESTAMP']}
-                            </small>
-                        </div>
-                        """, unsafe_allow_html=True)
-                
-                st.divider()
+            sort_by = st.selectbox("Sort by:", BROWSE_SORT_COLUMNS)
+        
+        # Filtering, sorting and paging run in Snowflake; only the visible page is fetched
+        page_size = 20
+        browse_filters = (filter_file_type, filter_language, filter_account, sort_by)
+        if st.session_state.get('browse_filters') != browse_filters:
+            st.session_state['browse_filters'] = browse_filters
+            st.session_state['page'] = 0
+        page = st.session_state['page']
+        
+        page_df = fetch_page(session, filter_file_type, filter_language, filter_account, sort_by, page * page_size, page_size)
+        total_rows = int(page_df['TOTAL_ROWS'].iloc[0]) if not page_df.empty else 0
+        page_count = max(1, -(-total_rows // page_size))
+        
+        st.subheader(f"Showing {total_rows} records")
+        
+        # One table for the page; the full transcript loads only for the selected row
+        browse_df = pd.DataFrame({
+            'Title': page_df['MEETING_TITLE'].fillna(page_df['FILE_NAME']),
+            'Account': page_df['ACCOUNT_NAME'],
+            'Date': page_df['CALL_START_TS'].astype(str).str[:10].where(page_df['CALL_START_TS'].notna()),
+            'Type': page_df['FILE_TYPE'],
+            'Language': page_df['DETECTED_LANGUAGE'],
+            'Speakers': page_df['SPEAKER_COUNT'].where(page_df['SPEAKER_COUNT'] > 0),
+            'Duration (s)': page_df['AUDIO_DURATION_SECONDS'].round(1),
+            'Preview': page_df['TRANSCRIPT_PREVIEW']
+        }) if not page_df.empty else pd.DataFrame()
+        event = st.dataframe(
+            browse_df,
+            on_select="rerun",
+            selection_mode="single-row",
+            hide_index=True,
+            use_container_width=True,
+            column_config={"Preview": st.column_config.TextColumn(width="large")},
+            key="browse_table_" + "_".join(map(str, (page,) + browse_filters))
+        )
         
-        if len(filtered_df) > 20:
-            st.info(f"Showing first 20 records. Total matching records: {len(filtered_df)}")
+        if page_count > 1:
+            col1, col2, col3 = st.columns([1, 3, 1])
+            
+            with col1:
+                if st.button("◀ Prev", disabled=page == 0):
+                    st.session_state['page'] = page - 1
+                    st.rerun()
+            
+            with col2:
+                st.info(f"Showing records {page * page_size + 1}-{page * page_size + len(page_df)}. Total matching records: {total_rows}")
+            
+            with col3:
+                if st.button("Next ▶", disabled=page >= page_count - 1):
+                    st.session_state['page'] = page + 1
+                    st.rerun()
+        
+        page_records = page_df.to_dict('records')
+        selected_rows = [i for i in event.selection.rows if i < len(page_records)]
+        if not selected_rows:
+            st.caption("Select a row to view its full transcript.")
+        else:
+            row = page_records[selected_rows[0]]
+            display_title = row['MEETING_TITLE'] if pd.notna(row.get('MEETING_TITLE')) else row['FILE_NAME']
+            st.markdown(f"**{display_title}**")
+            
+            # Segments for the whole page come back in one query, so picking another row is served from cache
+            speaker_files = tuple(r['FILE_NAME'] for r in page_records if r.get('SPEAKER_COUNT', 0) > 0)
+            page_segments = get_speaker_segments_bulk(session, speaker_files) if row['FILE_NAME'] in speaker_files else {}
+            
+            speaker_segments = page_segments.get(row['FILE_NAME'], [])
+            if speaker_segments:
+                st.markdown("**Speaker-separated transcript:**")
+                display_speaker_transcript(speaker_segments, as_table=transcript_as_table)
+            else:
+                # Regular transcript, also the fallback when no speaker segments were found
+                transcript = load_transcript_detail(session, row['FILE_NAME']).get('TRANSCRIPT')
+                st.markdown(f"""
+                <div class="transcript-box">
+                    <p>{html.escape(str(transcript))}</p>
+                    <hr>
+                    <small>
+                    Processing time: {row['PROCESSING_TIME_SECONDS']:.2f}s | 
+                    Timestamp: {row['TRANSCRIPTION_TIMESTAMP']}
+                    </small>
+                </div>
+                """, unsafe_allow_html=True)
     
     # Footer
     st.markdown("---")